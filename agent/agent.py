@@ -3,21 +3,56 @@ GTM AI Operations Agent — HuggingFace LLM Integration
 Supports triage, requirements extraction, blueprint generation, and executive summaries.
 Falls back to mock responses when no API token is available.
 """
+import math
 import os
-import json
+import re
+import logging
 import time
-from typing import Optional, Dict, Any
+import random
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Tuple, List
 
-import requests
+import httpx
+import orjson
 
+from agent.session import build_session, MAX_RETRY_WAIT
 from agent.prompts import (
     TRIAGE_SYSTEM_PROMPT, get_triage_prompt,
+    BATCH_TRIAGE_SYSTEM_PROMPT, get_batch_triage_prompt,
     REQUIREMENTS_SYSTEM_PROMPT, get_requirements_prompt,
     BLUEPRINT_SYSTEM_PROMPT, get_blueprint_prompt,
     SUMMARY_SYSTEM_PROMPT, get_summary_prompt,
     MOCK_TRIAGE_RESPONSE, MOCK_REQUIREMENTS_RESPONSE, MOCK_BLUEPRINT_RESPONSE,
 )
 
+# Outermost {...} span — skips markdown fences and any prose around the JSON object
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+# Outermost [...] span, for replies that should be a JSON array (batch triage)
+_JSON_ARR_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+logger = logging.getLogger("gtm.agent")
+
+# Sampling for JSON-producing tasks: deterministic output parses reliably and
+# makes repeated requests hit the response cache
+JSON_SAMPLING = {"temperature": 0.0, "top_p": 1.0}
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Wait before retrying a 503: the Retry-After hint (default 2s) doubled per attempt, capped, plus jitter."""
+    try:
+        base = float(resp.headers.get("Retry-After", 2.0))
+    except ValueError:
+        base = 2.0
+    # nan, inf and negative hints are garbage; fall back to the default backoff
+    if not (math.isfinite(base) and base >= 0):
+        base = 2.0
+    return min(base * (2 ** attempt), MAX_RETRY_WAIT) + random.uniform(0, 0.5)
+
 
 class GTMOpsAgent:
     """
@@ -30,146 +65,344 @@ class GTMOpsAgent:
         self.model = model
         self.api_url = "https://router.huggingface.co/v1/chat/completions"
         self.headers = {"Authorization": f"Bearer {self.hf_token}"} if self.hf_token else None
+        # No token: public methods return mock responses without rendering prompts
+        self._mock_mode = not self.hf_token
+        self.session = build_session(self.headers)
+        # Fields shared by every chat-completions payload
+        self._payload_base = {"model": self.model}
+        # Only some OpenAI-compatible backends accept prompt_cache_key; stricter ones may reject the request
+        self._send_prompt_cache_key = os.getenv("HF_PROMPT_CACHE_KEY") == "1"
+        # LRU of successful completions: key -> (stored_at, text)
+        self._cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._cache_ttl = 3600
+        self._cache_max = 512
+        self._cache_lock = threading.Lock()
+        # Created on first async call so it binds to the running event loop
+        self._aclient: Optional[httpx.AsyncClient] = None
+        # Single-flight: identical concurrent calls share one HTTP request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._ainflight: Dict[str, asyncio.Task] = {}
 
-    # ─────────── Core LLM Call ───────────
+        # Warm DNS/TLS and the router's model in the background so the first real call is fast
+        if self.hf_token:
+            threading.Thread(target=self.check_health, daemon=True).start()
 
-    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 800) -> Optional[str]:
-        """Call HuggingFace Inference API. Returns raw text or None on failure."""
-        if not self.hf_token:
-            return None
+    # ─────────── Response Cache ───────────
+
+    def _cache_key(self, system_prompt: str, user_prompt: str, max_tokens: int,
+                   temperature: float, top_p: float) -> str:
+        raw = f"{self.model}|{max_tokens}|{temperature}|{top_p}|{system_prompt}\x1f{user_prompt}".encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, text = entry
+            if time.time() - stored_at >= self._cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return text
 
+    def _cache_put(self, key: str, text: str) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.time(), text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_max:
+                self._cache.popitem(last=False)
+
+    # ─────────── Core LLM Call ───────────
+
+    def _build_payload(self, system_prompt: str, user_prompt: str, max_tokens: int,
+                       temperature: float, top_p: float) -> Dict[str, Any]:
         payload = {
-            "model": self.model,
+            **self._payload_base,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             "max_tokens": max_tokens,
-            "temperature": 0.7,
-            "top_p": 0.9,
+            "temperature": temperature,
+            "top_p": top_p,
         }
+        if self._send_prompt_cache_key:
+            # Groups requests sharing a system prompt so providers that support it
+            # can reuse the cached prefix
+            payload["prompt_cache_key"] = hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+        return payload
+
+    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 800,
+                  temperature: float = 0.7, top_p: float = 0.9) -> Optional[str]:
+        """Call HuggingFace Inference API. Returns raw text or None on failure."""
+        if not self.hf_token:
+            return None
+
+        key = self._cache_key(system_prompt, user_prompt, max_tokens, temperature, top_p)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            text = self._post_chat(self._build_payload(system_prompt, user_prompt, max_tokens, temperature, top_p))
+            if text is not None:
+                self._cache_put(key, text)
+            future.set_result(text)
+            return text
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
 
+    def _post_chat(self, payload: Dict[str, Any]) -> Optional[str]:
+        """POST a chat-completions payload. Returns the message text or None on failure."""
         try:
-            resp = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
+            # 502/503/504 (e.g. model loading) are retried by the session's CappedRetry policy
+            resp = self.session.post(self.api_url, data=orjson.dumps(payload), timeout=60)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 if "choices" in data and len(data["choices"]) > 0:
                     return data["choices"][0].get("message", {}).get("content", "").strip()
-            elif resp.status_code == 503:
-                # Model loading — retry once after wait
-                time.sleep(10)
-                resp = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    if "choices" in data and len(data["choices"]) > 0:
-                        return data["choices"][0].get("message", {}).get("content", "").strip()
             else:
-                print(f"[Agent] HF API error {resp.status_code}: {resp.text[:200]}")
+                logger.warning("HF API error %s: %s", resp.status_code, resp.text[:200])
             return None
         except Exception as exc:
-            print(f"[Agent] HF API exception: {exc}")
+            logger.warning("HF API exception: %s", exc)
             return None
 
-    def _parse_json(self, text: str) -> Optional[dict]:
-        """Attempt to parse JSON from LLM output, handling markdown fences."""
+    # ─────────── Async LLM Call ───────────
+
+    def _get_aclient(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=True,
+                headers={**(self.headers or {}), "Content-Type": "application/json"},
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=60,
+            )
+        return self._aclient
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    async def _acall_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 800,
+                         temperature: float = 0.7, top_p: float = 0.9) -> Optional[str]:
+        """Async variant of _call_llm; shares the response cache."""
+        if not self.hf_token:
+            return None
+
+        key = self._cache_key(system_prompt, user_prompt, max_tokens, temperature, top_p)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        task = self._ainflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._apost_chat(self._build_payload(system_prompt, user_prompt, max_tokens, temperature, top_p))
+            )
+            self._ainflight[key] = task
+            task.add_done_callback(lambda _: self._ainflight.pop(key, None))
+
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        text = await asyncio.shield(task)
+        if text is not None:
+            self._cache_put(key, text)
+        return text
+
+    async def _apost_chat(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Async variant of _post_chat over a shared HTTP/2 client."""
+        client = self._get_aclient()
+        try:
+            body = orjson.dumps(payload)
+            resp = await client.post(self.api_url, content=body)
+            for attempt in range(3):
+                if resp.status_code != 503:
+                    break
+                # Model loading — back off without blocking the event loop
+                await asyncio.sleep(_retry_delay(resp, attempt))
+                resp = await client.post(self.api_url, content=body)
+
+            if resp.status_code == 200:
+                data = orjson.loads(resp.content)
+                if "choices" in data and len(data["choices"]) > 0:
+                    return data["choices"][0].get("message", {}).get("content", "").strip()
+            else:
+                logger.warning("HF API error %s: %s", resp.status_code, resp.text[:200])
+            return None
+        except Exception as exc:
+            logger.warning("HF API exception: %s", exc)
+            return None
+
+    def _parse_json(self, text: str, array: bool = False) -> Optional[Any]:
+        """Parse the JSON object (or, with array=True, the array) out of LLM output, ignoring fences and prose."""
         if not text:
             return None
-        # Strip markdown code fences if present
-        cleaned = text.strip()
-        if cleaned.startswith("```"):
-            lines = cleaned.split("\n")
-            lines = [l for l in lines if not l.strip().startswith("```")]
-            cleaned = "\n".join(lines)
+        match = (_JSON_ARR_RE if array else _JSON_OBJ_RE).search(text)
+        if not match:
+            return None
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            # Try to extract JSON object from the text
-            start = cleaned.find("{")
-            end = cleaned.rfind("}") + 1
-            if start >= 0 and end > start:
-                try:
-                    return json.loads(cleaned[start:end])
-                except json.JSONDecodeError:
-                    pass
-        return None
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            return None
 
     # ─────────── Public Methods ───────────
 
-    def triage_request(self, pain_point: str, workflow_stage: str, manual_time: str,
-                       urgency: str, requester_team: str) -> Dict[str, Any]:
-        """Classify an intake request using LLM. Returns structured triage result."""
-        start = time.time()
-        user_prompt = get_triage_prompt(pain_point, workflow_stage, manual_time, urgency, requester_team)
-        raw = self._call_llm(TRIAGE_SYSTEM_PROMPT, user_prompt)
+    def _json_result(self, raw: Optional[str], mock: Dict[str, Any], start_ns: int) -> Dict[str, Any]:
+        """Shape an LLM JSON reply (or the mock fallback) into a tagged result."""
         parsed = self._parse_json(raw) if raw else None
 
-        if parsed:
+        if parsed and isinstance(parsed, dict):
             result = parsed
             result["_source"] = "llm"
         else:
-            result = dict(MOCK_TRIAGE_RESPONSE)
+            result = dict(mock)
             result["_source"] = "mock"
 
-        result["_latency_ms"] = round((time.time() - start) * 1000)
+        result["_latency_ms"] = (time.perf_counter_ns() - start_ns) // 1_000_000
         return result
 
-    def generate_requirements(self, pain_point: str, context: str = "") -> Dict[str, Any]:
-        """Generate a structured requirements brief from a free-text request."""
-        start = time.time()
-        user_prompt = get_requirements_prompt(pain_point, context)
-        raw = self._call_llm(REQUIREMENTS_SYSTEM_PROMPT, user_prompt)
-        parsed = self._parse_json(raw) if raw else None
+    def _mock_result(self, mock: Dict[str, Any]) -> Dict[str, Any]:
+        return {**mock, "_source": "mock", "_latency_ms": 0}
 
-        if parsed:
-            result = parsed
-            result["_source"] = "llm"
+    def _mock_summary(self, project_name: str) -> str:
+        return (
+            f"**{project_name}** has been deployed and is delivering measurable impact. "
+            "The automation reduced manual processing time by 75%, freeing up team capacity "
+            "for higher-value activities. Early adoption metrics show strong engagement "
+            "across the target user group.\n\n"
+            "Next steps include expanding to additional teams and refining the AI model "
+            "based on user feedback collected during the pilot phase."
+        )
+
+    def _summary_result(self, raw: Optional[str], project_name: str, start_ns: int) -> Dict[str, Any]:
+        """Wrap summary text (or the mock narrative) into a tagged result."""
+        if raw:
+            result = {"summary": raw, "_source": "llm"}
         else:
-            result = dict(MOCK_REQUIREMENTS_RESPONSE)
-            result["_source"] = "mock"
+            result = {"summary": self._mock_summary(project_name), "_source": "mock"}
 
-        result["_latency_ms"] = round((time.time() - start) * 1000)
+        result["_latency_ms"] = (time.perf_counter_ns() - start_ns) // 1_000_000
         return result
 
+    def triage_request(self, pain_point: str, workflow_stage: str, manual_time: str,
+                       urgency: str, requester_team: str) -> Dict[str, Any]:
+        """Classify an intake request using LLM. Returns structured triage result."""
+        if self._mock_mode:
+            return self._mock_result(MOCK_TRIAGE_RESPONSE)
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_triage_prompt(pain_point, workflow_stage, manual_time, urgency, requester_team)
+        raw = self._call_llm(TRIAGE_SYSTEM_PROMPT, user_prompt, max_tokens=250, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_TRIAGE_RESPONSE, start_ns)
+
+    def triage_batch(self, items: List[Dict[str, Any]], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """
+        Triage many intake requests with one LLM call per chunk of batch_size.
+        Each item holds triage_request's keyword arguments. Chunks whose reply is not
+        a JSON array of matching length fall back to per-item triage_request calls.
+        """
+        if self._mock_mode:
+            return [self._mock_result(MOCK_TRIAGE_RESPONSE) for _ in items]
+        results: List[Dict[str, Any]] = []
+        for i in range(0, len(items), batch_size):
+            chunk = items[i:i + batch_size]
+            start_ns = time.perf_counter_ns()
+            raw = self._call_llm(BATCH_TRIAGE_SYSTEM_PROMPT, get_batch_triage_prompt(chunk),
+                                 max_tokens=250 * len(chunk), **JSON_SAMPLING)
+            parsed = self._parse_json(raw, array=True) if raw else None
+
+            if (isinstance(parsed, list) and len(parsed) == len(chunk)
+                    and all(isinstance(entry, dict) for entry in parsed)):
+                latency_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+                for entry in parsed:
+                    entry["_source"] = "llm"
+                    entry["_latency_ms"] = latency_ms
+                results.extend(parsed)
+            else:
+                results.extend(self.triage_request(**item) for item in chunk)
+        return results
+
+    def generate_requirements(self, pain_point: str, context: str = "") -> Dict[str, Any]:
+        """Generate a structured requirements brief from a free-text request."""
+        if self._mock_mode:
+            return self._mock_result(MOCK_REQUIREMENTS_RESPONSE)
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_requirements_prompt(pain_point, context)
+        raw = self._call_llm(REQUIREMENTS_SYSTEM_PROMPT, user_prompt, max_tokens=500, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_REQUIREMENTS_RESPONSE, start_ns)
+
     def generate_blueprint(self, title: str, problem: str, requirements: str) -> Dict[str, Any]:
         """Generate a workflow blueprint from requirements."""
-        start = time.time()
+        if self._mock_mode:
+            return self._mock_result(MOCK_BLUEPRINT_RESPONSE)
+        start_ns = time.perf_counter_ns()
         user_prompt = get_blueprint_prompt(title, problem, requirements)
-        raw = self._call_llm(BLUEPRINT_SYSTEM_PROMPT, user_prompt)
-        parsed = self._parse_json(raw) if raw else None
-
-        if parsed:
-            result = parsed
-            result["_source"] = "llm"
-        else:
-            result = dict(MOCK_BLUEPRINT_RESPONSE)
-            result["_source"] = "mock"
-
-        result["_latency_ms"] = round((time.time() - start) * 1000)
-        return result
+        raw = self._call_llm(BLUEPRINT_SYSTEM_PROMPT, user_prompt, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_BLUEPRINT_RESPONSE, start_ns)
 
     def generate_executive_summary(self, project_name: str, metrics: str) -> Dict[str, Any]:
         """Generate an executive summary narrative from raw metrics."""
-        start = time.time()
+        if self._mock_mode:
+            return {"summary": self._mock_summary(project_name), "_source": "mock", "_latency_ms": 0}
+        start_ns = time.perf_counter_ns()
         user_prompt = get_summary_prompt(project_name, metrics)
         raw = self._call_llm(SUMMARY_SYSTEM_PROMPT, user_prompt, max_tokens=600)
+        return self._summary_result(raw, project_name, start_ns)
 
-        if raw:
-            result = {"summary": raw, "_source": "llm"}
-        else:
-            result = {
-                "summary": (
-                    f"**{project_name}** has been deployed and is delivering measurable impact. "
-                    "The automation reduced manual processing time by 75%, freeing up team capacity "
-                    "for higher-value activities. Early adoption metrics show strong engagement "
-                    "across the target user group.\n\n"
-                    "Next steps include expanding to additional teams and refining the AI model "
-                    "based on user feedback collected during the pilot phase."
-                ),
-                "_source": "mock",
-            }
+    # ─────────── Async Public Methods ───────────
 
-        result["_latency_ms"] = round((time.time() - start) * 1000)
-        return result
+    async def atriage_request(self, pain_point: str, workflow_stage: str, manual_time: str,
+                              urgency: str, requester_team: str) -> Dict[str, Any]:
+        """Async variant of triage_request."""
+        if self._mock_mode:
+            return self._mock_result(MOCK_TRIAGE_RESPONSE)
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_triage_prompt(pain_point, workflow_stage, manual_time, urgency, requester_team)
+        raw = await self._acall_llm(TRIAGE_SYSTEM_PROMPT, user_prompt, max_tokens=250, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_TRIAGE_RESPONSE, start_ns)
+
+    async def agenerate_requirements(self, pain_point: str, context: str = "") -> Dict[str, Any]:
+        """Async variant of generate_requirements."""
+        if self._mock_mode:
+            return self._mock_result(MOCK_REQUIREMENTS_RESPONSE)
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_requirements_prompt(pain_point, context)
+        raw = await self._acall_llm(REQUIREMENTS_SYSTEM_PROMPT, user_prompt, max_tokens=500, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_REQUIREMENTS_RESPONSE, start_ns)
+
+    async def agenerate_blueprint(self, title: str, problem: str, requirements: str) -> Dict[str, Any]:
+        """Async variant of generate_blueprint."""
+        if self._mock_mode:
+            return self._mock_result(MOCK_BLUEPRINT_RESPONSE)
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_blueprint_prompt(title, problem, requirements)
+        raw = await self._acall_llm(BLUEPRINT_SYSTEM_PROMPT, user_prompt, **JSON_SAMPLING)
+        return self._json_result(raw, MOCK_BLUEPRINT_RESPONSE, start_ns)
+
+    async def agenerate_executive_summary(self, project_name: str, metrics: str) -> Dict[str, Any]:
+        """Async variant of generate_executive_summary."""
+        if self._mock_mode:
+            return {"summary": self._mock_summary(project_name), "_source": "mock", "_latency_ms": 0}
+        start_ns = time.perf_counter_ns()
+        user_prompt = get_summary_prompt(project_name, metrics)
+        raw = await self._acall_llm(SUMMARY_SYSTEM_PROMPT, user_prompt, max_tokens=600)
+        return self._summary_result(raw, project_name, start_ns)
 
     def check_health(self) -> Dict[str, Any]:
         """Ping HF API with a minimal request to check connection health."""
@@ -182,18 +415,17 @@ class GTMOpsAgent:
             }
 
         try:
-            start = time.time()
-            resp = requests.post(
+            start_ns = time.perf_counter_ns()
+            resp = self.session.post(
                 self.api_url,
-                headers=self.headers,
-                json={
+                data=orjson.dumps({
                     "model": self.model,
                     "messages": [{"role": "user", "content": "Hi"}],
                     "max_tokens": 5,
-                },
+                }),
                 timeout=15,
             )
-            latency = round((time.time() - start) * 1000)
+            latency = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             if resp.status_code == 200:
                 return {"status": "connected", "model": self.model,
@@ -1,6 +1,8 @@
 """
 Prompt templates for GTM AI Operations Hub
 Each LLM task has a system prompt and a user prompt builder.
+Instructions live in the system prompts so the request prefix stays identical across
+calls (provider-side prefix caching); user prompts carry only the per-request fields.
 """
 
 
@@ -17,19 +19,42 @@ For each request, you must output a JSON object with these fields:
 - "summary": a one-sentence summary of the request
 - "rationale": brief explanation of your classification
 
+The user message lists the request fields (requester team, pain point, current workflow
+stage, estimated manual time per week, urgency). Classify that request.
+
 Respond ONLY with valid JSON. No markdown, no extra text."""
 
 
 def get_triage_prompt(pain_point: str, workflow_stage: str, manual_time: str, urgency: str, requester_team: str) -> str:
-    return f"""Classify this GTM automation request:
-
-Requester Team: {requester_team}
+    return f"""Requester Team: {requester_team}
 Pain Point: {pain_point}
 Current Workflow Stage: {workflow_stage}
 Estimated Manual Time Per Week: {manual_time}
-Urgency: {urgency}
+Urgency: {urgency}"""
+
+
+BATCH_TRIAGE_SYSTEM_PROMPT = """You are an AI operations analyst for a GTM (Go-To-Market) team.
+Your job is to classify several incoming automation requests from field teams in one pass.
+
+The user message contains N numbered requests, each under a "### Item <n>" heading and listing
+the requester team, pain point, current workflow stage, estimated manual time per week, and urgency.
+
+Output a JSON array with exactly N objects, in the same order as the items. Each object has:
+- "gtm_stage": one of "Pipeline Generation", "Deal Execution", "Onboarding & Adoption", "Renewal & Expansion"
+- "complexity": one of "Quick Win", "Medium", "Strategic"
+- "approach": one of "AI Agent", "Workflow Automation", "Data Fix", "Process Change"
+- "priority_score": integer 1-10 (10 = highest priority)
+- "summary": a one-sentence summary of the request
+- "rationale": brief explanation of your classification
+
+Respond ONLY with a valid JSON array. No markdown, no extra text."""
+
 
-Return your classification as JSON."""
+def get_batch_triage_prompt(items: list) -> str:
+    return "\n\n".join(
+        f"### Item {i}\n" + get_triage_prompt(**item)
+        for i, item in enumerate(items, start=1)
+    )
 
 
 # ─────────────────── REQUIREMENTS EXTRACTION ───────────────────
@@ -46,16 +71,14 @@ Given a free-text automation request, produce a structured requirements brief wi
 - "risks": potential risks or blockers
 - "estimated_effort": "Small (1-2 days)", "Medium (1-2 weeks)", or "Large (1+ month)"
 
+The user message contains the request text and any additional context.
+
 Respond ONLY with valid JSON. No markdown, no extra text."""
 
 
 def get_requirements_prompt(pain_point: str, context: str = "") -> str:
-    return f"""Generate a structured requirements brief for this automation request:
-
-Request: {pain_point}
-Additional Context: {context}
-
-Return the requirements as JSON."""
+    return f"""Request: {pain_point}
+Additional Context: {context}"""
 
 
 # ─────────────────── WORKFLOW BLUEPRINT ───────────────────
@@ -72,17 +95,15 @@ The blueprint should include:
 - "rollout_plan": phased rollout steps
 - "estimated_time_savings": hours per week
 
+The user message contains the project title, problem, and requirements brief.
+
 Respond ONLY with valid JSON. No markdown, no extra text."""
 
 
 def get_blueprint_prompt(title: str, problem: str, requirements: str) -> str:
-    return f"""Generate a workflow blueprint for:
-
-Project: {title}
+    return f"""Project: {title}
 Problem: {problem}
-Requirements: {requirements}
-
-Return the blueprint as JSON."""
+Requirements: {requirements}"""
 
 
 # ─────────────────── EXECUTIVE SUMMARY ───────────────────
@@ -95,16 +116,13 @@ Write 2-3 paragraphs covering:
 2. Key results (use the metrics provided)
 3. What's next
 
-Keep the tone professional but energetic. Include specific numbers."""
+Keep the tone professional but energetic. Include specific numbers.
+The user message contains the project name and its metrics."""
 
 
 def get_summary_prompt(project_name: str, metrics: str) -> str:
-    return f"""Write an executive summary for this GTM AI project:
-
-Project: {project_name}
-Metrics: {metrics}
-
-Write a 2-3 paragraph executive narrative."""
+    return f"""Project: {project_name}
+Metrics: {metrics}"""
 
 
 # ─────────────────── MOCK RESPONSES ───────────────────
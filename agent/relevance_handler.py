@@ -3,8 +3,13 @@ Relevance AI Agent Handler
 Supports triggering specialized GTM research agents and checking connectivity.
 """
 import os
-import requests
-from typing import Optional, Dict, Any
+import time
+import threading
+from typing import Dict, Any
+
+import orjson
+
+from agent.session import build_session
 
 class RelevanceAgentHandler:
     """
@@ -27,6 +32,11 @@ class RelevanceAgentHandler:
             "Authorization": f"{self.project_id}:{self.api_key}",
             "Content-Type": "application/json"
         }
+        self.session = build_session(self.headers)
+
+        # Warm DNS/TLS to the Relevance stack in the background
+        if all([self.project_id, self.api_key, self.agent_id]):
+            threading.Thread(target=self.check_health, daemon=True).start()
 
     def trigger_research(self, company_name: str, context: str = "") -> Dict[str, Any]:
         """
@@ -45,9 +55,9 @@ class RelevanceAgentHandler:
         }
 
         try:
-            resp = requests.post(url, headers=self.headers, json=payload, timeout=30)
+            resp = self.session.post(url, data=orjson.dumps(payload), timeout=30)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 return {
                     "status": "success",
                     "conversation_id": data.get("conversation_id"),
@@ -71,7 +81,7 @@ class RelevanceAgentHandler:
         # Use agents list as a general connectivity check
         url = f"{self.base_url}/agents/list"
         try:
-            resp = requests.get(url, headers=self.headers, timeout=10)
+            resp = self.session.get(url, timeout=10)
             if resp.status_code == 200:
                 return {"status": "connected", "message": "Relevance AI Online"}
             else:
@@ -95,17 +105,10 @@ class RelevanceAgentHandler:
             }
         }
 
-        headers = {
-            "Authorization": f"{self.project_id}:{self.api_key}",
-            "Content-Type": "application/json"
-        }
-
-        import time
-
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=30)
+            resp = self.session.post(url, data=orjson.dumps(payload), timeout=30)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 
                 job_info = data.get("job_info", {})
                 job_id = job_info.get("job_id")
@@ -114,12 +117,15 @@ class RelevanceAgentHandler:
                 if job_id and studio_id:
                     poll_url = f"{self.base_url}/studios/{studio_id}/async_poll/{job_id}"
                     
-                    # Poll for up to 60 seconds
-                    for _ in range(30):
-                        time.sleep(2)
-                        p_resp = requests.get(poll_url, headers=headers, timeout=30)
+                    # Poll for up to 60 seconds, backing off from 0.25s to a 2s cap
+                    deadline = time.monotonic() + 60
+                    delay = 0.25
+                    while time.monotonic() < deadline:
+                        time.sleep(delay)
+                        delay = min(delay * 1.5, 2.0)
+                        p_resp = self.session.get(poll_url, timeout=30)
                         if p_resp.status_code == 200:
-                            p_data = p_resp.json()
+                            p_data = orjson.loads(p_resp.content)
                             updates = p_data.get("updates", [])
                             
                             # Search backwards for the final answer
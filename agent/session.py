@@ -0,0 +1,46 @@
+"""
+Shared HTTP session factory for outbound API calls (HuggingFace, Relevance AI).
+Keeps TLS connections alive across calls instead of reconnecting per request.
+"""
+import random
+from typing import Optional, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Longest we'll wait between retries, whatever the server's Retry-After says
+MAX_RETRY_WAIT = 8.0
+
+
+class CappedRetry(Retry):
+    """Retry policy that caps Retry-After hints and adds jitter to backoff."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_WAIT)
+
+    def get_backoff_time(self):
+        return min(super().get_backoff_time(), MAX_RETRY_WAIT) + random.uniform(0, 0.5)
+
+
+def build_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """Create a keep-alive session with a connection pool and transient-error retries."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=CappedRetry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods={"POST", "GET"},
+            # Hand the final response back so callers can inspect the status code
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.headers.update(headers or {})
+    session.headers.update({"Content-Type": "application/json"})
+    return session
@@ -1,42 +1,24 @@
 """
 Pydantic data models for GTM AI Operations Hub
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
-from enum import Enum
+from pydantic import BaseModel, ConfigDict
+from typing import Literal, Optional
 
+from data.seed import ENUMS
 
-class GTMStage(str, Enum):
-    PIPELINE = "Pipeline Generation"
-    DEAL = "Deal Execution"
-    ONBOARDING = "Onboarding & Adoption"
-    RENEWAL = "Renewal & Expansion"
+# Shared by every model: immutable records (use .model_copy(update=...) to change a field),
+# unknown keys dropped
+MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
-class Complexity(str, Enum):
-    QUICK = "Quick Win"
-    MEDIUM = "Medium"
-    STRATEGIC = "Strategic"
-
-
-class Approach(str, Enum):
-    AGENT = "AI Agent"
-    AUTOMATION = "Workflow Automation"
-    DATA_FIX = "Data Fix"
-    PROCESS = "Process Change"
-
-
-class BacklogStatus(str, Enum):
-    INTAKE = "Intake"
-    SCOPING = "Scoping"
-    IN_BUILD = "In Build"
-    QA = "QA"
-    DEPLOYED = "Deployed"
-    MEASURING = "Measuring"
+# Same value set as the backlog_status_t ENUM column. gtm_stage, complexity and approach stay
+# plain str: they hold whatever the LLM returned, including the "Unknown" fallbacks
+BacklogStatusT = Literal[tuple(ENUMS["backlog_status_t"])]
 
 
 class IntakeRequest(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: Optional[str] = None
     requester_name: str
     requester_team: str
@@ -51,10 +33,12 @@ class IntakeRequest(BaseModel):
     approach: Optional[str] = None
     priority_score: Optional[int] = None
     triage_summary: Optional[str] = None
-    status: str = "Intake"
+    status: BacklogStatusT = "Intake"
 
 
 class BacklogItem(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str
     request_id: str
     title: str
@@ -64,7 +48,7 @@ class BacklogItem(BaseModel):
     complexity: str
     approach: str
     priority_score: int
-    status: str = "Intake"
+    status: BacklogStatusT = "Intake"
     assigned_to: Optional[str] = None
     estimated_time_savings: Optional[str] = None
     created_at: Optional[str] = None
@@ -72,6 +56,8 @@ class BacklogItem(BaseModel):
 
 
 class PromptVersion(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str
     request_id: str
     version: int
@@ -82,6 +68,8 @@ class PromptVersion(BaseModel):
 
 
 class ImpactMetric(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str
     request_id: str
     title: str
@@ -3,238 +3,562 @@ Database seed script — populates DuckDB with realistic GTM operations data.
 Run standalone: python -m data.seed
 Or imported by the webapp on first launch.
 """
-import duckdb
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# duckdb and pandas are native-heavy; they're imported where used so importing
+# DB_PATH or the schema constants stays cheap
+if TYPE_CHECKING:
+    import duckdb
 
 DB_PATH = str(Path(__file__).parent / "ops_hub.duckdb")
+# Parquet snapshots of the seed tables, regenerated with: python -m data.seed --export
+SEED_DIR = Path(__file__).parent / "fixtures"
+# Prebuilt copy of a freshly seeded database (python -m data.seed --build-seed-file)
+SEED_FILE = Path(__file__).parent / "ops_hub.seed.duckdb"
+
+# Sizing for the long-lived connection initialize_database() opens, which serves every web
+# request. The app's tables are small, so it doesn't need a thread per core or DuckDB's default
+# 80%-of-RAM buffer pool; set DUCK_THREADS / DUCK_MEMORY_LIMIT to resize it for the deployment.
+DUCK_THREADS = int(os.getenv("DUCK_THREADS", "2"))
+DUCK_MEMORY_LIMIT = os.getenv("DUCK_MEMORY_LIMIT", "256MB")
+
+# One long-lived connection per database file; callers take cheap cursors off it
+_connections: Dict[str, duckdb.DuckDBPyConnection] = {}
+_connections_lock = threading.Lock()
+# Process-wide in-memory instance that initialize_database(attach_as=...) attaches files to
+_attach_host: Optional[duckdb.DuckDBPyConnection] = None
+
+
+def _connect(db_path: str, threads: Optional[int], memory_limit: Optional[str]) -> duckdb.DuckDBPyConnection:
+    import duckdb
+
+    config = {}
+    if threads is not None:
+        config["threads"] = str(threads)
+    if memory_limit is not None:
+        config["memory_limit"] = memory_limit
+    return duckdb.connect(db_path, read_only=False, config=config)
+
+
+def get_connection(
+    db_path: str = DB_PATH,
+    *,
+    threads: Optional[int] = None,
+    memory_limit: Optional[str] = None,
+) -> duckdb.DuckDBPyConnection:
+    """Get a cursor on the shared DuckDB connection for db_path (creates file if needed).
+
+    Closing the cursor leaves the shared connection open; close_connection() closes that.
+    In-memory databases aren't shared: every ":memory:" call gets its own private database.
+    threads / memory_limit only apply when this call opens the connection.
+    """
+    if db_path.startswith(":memory:"):
+        return _connect(db_path, threads, memory_limit)
+    with _connections_lock:
+        con = _connections.get(db_path)
+        if con is None:
+            con = _connections[db_path] = _connect(db_path, threads, memory_limit)
+        return con.cursor()
+
+
+def close_connection(db_path: str = DB_PATH):
+    """Close and forget the shared connection for db_path, if open."""
+    with _connections_lock:
+        con = _connections.pop(db_path, None)
+    if con is not None:
+        con.close()
+
+
+# ENUM types for the closed, app-controlled value sets: one small integer per row and
+# integer compares in filters. Columns fed by free-form LLM output (gtm_stage, complexity,
+# approach) or with mixed-case seed values (intake urgency/status) stay VARCHAR, which
+# DuckDB dictionary-compresses on disk anyway.
+ENUMS: Dict[str, List[str]] = {
+    "backlog_status_t": ["Intake", "Scoping", "In Build", "QA", "Deployed", "Measuring"],
+    "qa_status_t": ["pass", "warning", "fail"],
+}
+
+# Table name → (column, type and constraints), in column order; the DDL is generated from this.
+# Keys stay inline: DuckDB 0.9 can't ALTER TABLE ... ADD CONSTRAINT after a bulk load,
+# and a post-load unique index can't stand in as an FK target
+SCHEMA: Dict[str, List[Tuple[str, str]]] = {
+    "intake_requests": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("requester_name", "VARCHAR"),
+        ("requester_team", "VARCHAR"),
+        ("pain_point", "TEXT"),
+        ("workflow_stage", "VARCHAR"),
+        ("manual_time_hours", "DOUBLE"),
+        ("urgency", "VARCHAR"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+        ("gtm_stage", "VARCHAR"),
+        ("complexity", "VARCHAR"),
+        ("approach", "VARCHAR"),
+        ("priority_score", "INTEGER"),
+        ("triage_summary", "TEXT"),
+        ("requirements_json", "TEXT"),
+        ("status", "VARCHAR DEFAULT 'Intake'"),
+    ],
+    "backlog_items": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("request_id", "VARCHAR REFERENCES intake_requests(id)"),
+        ("title", "VARCHAR"),
+        ("requester_name", "VARCHAR"),
+        ("requester_team", "VARCHAR"),
+        ("gtm_stage", "VARCHAR"),
+        ("complexity", "VARCHAR"),
+        ("approach", "VARCHAR"),
+        ("priority_score", "INTEGER"),
+        ("status", "backlog_status_t DEFAULT 'Intake'"),
+        ("assigned_to", "VARCHAR"),
+        ("estimated_time_savings", "VARCHAR"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+        ("updated_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+    "prompt_versions": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("request_id", "VARCHAR REFERENCES intake_requests(id)"),
+        ("version", "INTEGER"),
+        ("prompt_text", "TEXT"),
+        ("response_text", "TEXT"),
+        ("quality_score", "DOUBLE"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+    "impact_metrics": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("request_id", "VARCHAR REFERENCES intake_requests(id)"),
+        ("title", "VARCHAR"),
+        ("status", "VARCHAR"),
+        ("manual_time_before", "DOUBLE"),
+        ("ai_time_after", "DOUBLE"),
+        ("adoption_rate", "DOUBLE"),
+        ("roi_estimate", "DOUBLE"),
+        ("weeks_deployed", "INTEGER"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+    "audit_log": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("timestamp", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+        ("event_type", "VARCHAR"),
+        ("actor", "VARCHAR"),
+        ("request_id", "VARCHAR"),
+        ("description", "TEXT"),
+        ("input_snapshot", "TEXT"),
+        ("output_snapshot", "TEXT"),
+    ],
+    "qa_checks": [
+        ("id", "VARCHAR PRIMARY KEY"),
+        ("request_id", "VARCHAR"),
+        ("workflow_title", "VARCHAR"),
+        ("check_name", "VARCHAR"),
+        ("status", "qa_status_t"),
+        ("details", "TEXT"),
+        ("run_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+    # LLM triage + requirements per normalized intake, so repeat submissions skip the model
+    # (not seeded)
+    "llm_cache": [
+        ("key", "VARCHAR PRIMARY KEY"),
+        ("triage", "TEXT"),
+        ("requirements", "TEXT"),
+        ("created_at", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    ],
+}
+
+
+def _ddl(table: str, columns: List[Tuple[str, str]]) -> str:
+    body = ",\n".join(f"    {name} {definition}" for name, definition in columns)
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n{body}\n);"
+
+
+# Secondary indexes for the webapp's per-request lookups and filters. Only columns the app
+# never UPDATEs: DuckDB 0.9 rewrites an update to an indexed column as delete + insert,
+# which trips the primary key (so no index on backlog_items.status).
+INDEXES: List[Tuple[str, str]] = [
+    ("backlog_items", "request_id"),
+    ("backlog_items", "requester_team"),
+    ("prompt_versions", "request_id"),
+    ("impact_metrics", "request_id"),
+    ("audit_log", "request_id"),
+    ("qa_checks", "request_id"),
+    ("qa_checks", "status"),
+]
+
+
+def _index_ddl(table: str, column: str) -> str:
+    return f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column});"
 
 
-def get_connection(db_path: str = DB_PATH) -> duckdb.DuckDBPyConnection:
-    """Get a DuckDB connection (creates file if needed)."""
-    return duckdb.connect(db_path)
+# All tables in one multi-statement script so first launch parses the schema once
+DDL = "\n\n".join(
+    [_ddl(table, columns) for table, columns in SCHEMA.items()]
+    + [_index_ddl(table, column) for table, column in INDEXES]
+)
+
+
+def _enum_ddl(name: str, values: List[str]) -> str:
+    labels = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+    return f"CREATE TYPE {name} AS ENUM ({labels});"
 
 
 def create_tables(con: duckdb.DuckDBPyConnection):
     """Create all tables if they don't exist."""
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS intake_requests (
-            id VARCHAR PRIMARY KEY,
-            requester_name VARCHAR,
-            requester_team VARCHAR,
-            pain_point TEXT,
-            workflow_stage VARCHAR,
-            manual_time_hours DOUBLE,
-            urgency VARCHAR,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            gtm_stage VARCHAR,
-            complexity VARCHAR,
-            approach VARCHAR,
-            priority_score INTEGER,
-            triage_summary TEXT,
-            requirements_json TEXT,
-            status VARCHAR DEFAULT 'Intake'
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS backlog_items (
-            id VARCHAR PRIMARY KEY,
-            request_id VARCHAR REFERENCES intake_requests(id),
-            title VARCHAR,
-            requester_name VARCHAR,
-            requester_team VARCHAR,
-            gtm_stage VARCHAR,
-            complexity VARCHAR,
-            approach VARCHAR,
-            priority_score INTEGER,
-            status VARCHAR DEFAULT 'Intake',
-            assigned_to VARCHAR,
-            estimated_time_savings VARCHAR,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS prompt_versions (
-            id VARCHAR PRIMARY KEY,
-            request_id VARCHAR REFERENCES intake_requests(id),
-            version INTEGER,
-            prompt_text TEXT,
-            response_text TEXT,
-            quality_score DOUBLE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS impact_metrics (
-            id VARCHAR PRIMARY KEY,
-            request_id VARCHAR REFERENCES intake_requests(id),
-            title VARCHAR,
-            status VARCHAR,
-            manual_time_before DOUBLE,
-            ai_time_after DOUBLE,
-            adoption_rate DOUBLE,
-            roi_estimate DOUBLE,
-            weeks_deployed INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id VARCHAR PRIMARY KEY,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            event_type VARCHAR,
-            actor VARCHAR,
-            request_id VARCHAR,
-            description TEXT,
-            input_snapshot TEXT,
-            output_snapshot TEXT
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS qa_checks (
-            id VARCHAR PRIMARY KEY,
-            request_id VARCHAR,
-            workflow_title VARCHAR,
-            check_name VARCHAR,
-            status VARCHAR,
-            details TEXT,
-            run_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    # DuckDB 0.9 has no CREATE TYPE IF NOT EXISTS, so only the missing enums are added
+    existing = {
+        name for (name,) in con.execute(
+            "SELECT type_name FROM duckdb_types() WHERE database_name = current_database()"
+        ).fetchall()
+    }
+    missing = [_enum_ddl(name, values) for name, values in ENUMS.items() if name not in existing]
+    con.execute("\n".join(missing + [DDL]))
+
+
+# Columns each seed block supplies, in tuple order; the rest fall back to defaults
+SEED_COLUMNS: Dict[str, List[str]] = {
+    "intake_requests": ["id", "requester_name", "requester_team", "pain_point", "gtm_stage", "urgency", "status", "created_at"],
+    "backlog_items": ["id", "request_id", "title", "requester_name", "requester_team", "gtm_stage", "complexity", "approach", "priority_score", "status", "assigned_to", "estimated_time_savings"],
+    "impact_metrics": ["id", "request_id", "title", "status", "manual_time_before", "ai_time_after", "adoption_rate", "roi_estimate", "weeks_deployed"],
+    "prompt_versions": ["id", "request_id", "version", "prompt_text", "response_text", "quality_score"],
+    "audit_log": ["id", "timestamp", "event_type", "actor", "request_id", "description", "input_snapshot", "output_snapshot"],
+    "qa_checks": ["id", "request_id", "workflow_title", "check_name", "status", "details", "run_at"],
+}
+
+# pandas dtype per SQL type, so staged seed frames already match the columns they land in
+_PANDAS_DTYPES = {
+    "VARCHAR": "string",
+    "TEXT": "string",
+    "TIMESTAMP": "datetime64[us]",  # DuckDB TIMESTAMP is microsecond precision
+    "DOUBLE": "float64",
+    "INTEGER": "Int32",  # nullable, like the column
+    **{name: "string" for name in ENUMS},  # cast to the enum by DuckDB on insert
+}
+
+_SEED_DTYPES: Dict[str, Dict[str, str]] = {
+    table: {
+        name: _PANDAS_DTYPES[definition.split()[0]]
+        for name, definition in SCHEMA[table]
+        if name in columns
+    }
+    for table, columns in SEED_COLUMNS.items()
+}
+
+# Rows are written in this order. DuckDB has no clustered tables, so audit_log is loaded
+# oldest-first to match how the app appends to it: each row group then covers a narrow
+# time range and its min/max zonemap lets "recent events" scans skip the older groups.
+_LOAD_ORDER = {"audit_log": "timestamp"}
+
+
+def _load_order(table: str) -> str:
+    return _LOAD_ORDER.get(table, "id")
+
+
+# Built once at import so every seed run sends DuckDB the identical statement text
+_SQL_INSERT_SEED = {
+    table: f"INSERT INTO {table} ({', '.join(columns)}) SELECT * FROM {table}_src ORDER BY {_load_order(table)}"
+    for table, columns in SEED_COLUMNS.items()
+}
+
+# Same column order as the snapshot files, so each one loads with a single read_parquet scan
+_SQL_INSERT_PARQUET = {
+    table: f"INSERT INTO {table} ({', '.join(columns)}) SELECT * FROM read_parquet(?) ORDER BY {_load_order(table)}"
+    for table, columns in SEED_COLUMNS.items()
+}
+
+
+def _seed_file(table: str) -> Path:
+    return SEED_DIR / f"{table}.parquet"
+
+
+# Under this many rows the appender beats planning an INSERT ... SELECT over a registered view
+_APPEND_MAX_ROWS = 1000
+
+
+def _bulk_load(con: duckdb.DuckDBPyConnection, table: str):
+    """Load a table's seed columns in one bulk operation; unlisted columns get their defaults."""
+    import pandas as pd
+
+    frame = pd.DataFrame(SEED_DATA[table]).astype(_SEED_DTYPES[table]).sort_values(_load_order(table))
+    if len(frame) < _APPEND_MAX_ROWS:
+        con.append(table, frame, by_name=True)
+        return
+
+    source = f"{table}_src"
+    con.register(source, frame)
+    try:
+        con.execute(_SQL_INSERT_SEED[table])
+    finally:
+        con.unregister(source)
+
+
+@contextmanager
+def transaction(con: duckdb.DuckDBPyConnection):
+    """Run the block as one transaction: a single commit, rolled back if anything fails."""
+    con.execute("BEGIN TRANSACTION")
+    try:
+        yield
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
+
+
+def _is_seeded(con: duckdb.DuckDBPyConnection) -> bool:
+    """Whether intake_requests exists and has at least one row (no need to count them all)."""
+    # fetchall, not fetchone: DuckDB 0.9 fails the next multi-statement execute (the DDL)
+    # if a result is left open on a connection that has run an explicit transaction
+    exists = con.execute(
+        "SELECT 1 FROM duckdb_tables() WHERE database_name = current_database() "
+        "AND schema_name = current_schema() AND table_name = 'intake_requests'"
+    ).fetchall()
+    return bool(exists) and bool(con.execute("SELECT 1 FROM intake_requests LIMIT 1").fetchall())
+
+
+def _load_seed(con: duckdb.DuckDBPyConnection):
+    """Load every seed table, from the parquet snapshots when all of them are present."""
+    if all(_seed_file(table).exists() for table in SEED_COLUMNS):
+        _load_seed_files(con)
+    else:
+        _insert_seed_rows(con)
 
 
 def seed_data(con: duckdb.DuckDBPyConnection):
     """Insert realistic seed data."""
-    # Check if already seeded
-    count = con.execute("SELECT COUNT(*) FROM intake_requests").fetchone()[0]
-    if count > 0:
+    if _is_seeded(con):
         return  # Already seeded
 
-    # ── Intake Requests ──
-    requests_data = [
-        ("REQ-001", "Sarah Chen", "AE", "Cloud consumption-based churn early warning system using real-time engagement signals.", "Expansion & Renewal", "CRITICAL", "IN BUILD", "2026-02-15 09:00:00"),
-        ("REQ-002", "James Rodriguez", "Customer Success", "Automated QBR data aggregation from data streaming sources for enterprise customers.", "Onboarding & Adoption", "HIGH", "INTAKE", "2026-02-16 10:30:00"),
-        ("REQ-003", "Priya Patel", "RevOps", "Real-time deal health scoring using activity signals and data motion patterns.", "Deal Execution", "MEDIUM", "INTAKE", "2026-02-16 11:45:00"),
-        ("REQ-004", "Mike Ross", "SDR", "AI-powered personalized outreach agent for high-intent 'Cloud Pulse' signals.", "Pipeline Generation", "HIGH", "DEPLOYED", "2026-02-14 14:20:00"),
-        ("REQ-005", "Elena Gomez", "Sales (Manager)", "Automated forecast risk detection based on deal velocity and data stream signals.", "Deal Execution", "CRITICAL", "SCOPING", "2026-02-17 08:30:00"),
-        ("REQ-006", "David Kim", "Customer Success", "Automatic success plan generation based on platform usage bottlenecks.", "Onboarding & Adoption", "MEDIUM", "QA", "2026-02-17 10:15:00"),
-        ("REQ-007", "Rachel Foster", "Sales (Manager)", "Territory 'Data in Motion' map for identifying real-time expansion pockets.", "Expansion & Renewal", "MEDIUM", "INTAKE", "2026-02-17 14:00:00"),
-        ("REQ-008", "Alex Nguyen", "RevOps", "Automated CRM data hygiene scanning for cloud-native record attributes.", "Pipeline Generation", "LOW", "INTAKE", "2026-02-17 15:30:00")
-    ]
-
-    con.executemany("""
-        INSERT INTO intake_requests (id, requester_name, requester_team, pain_point, gtm_stage, urgency, status, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, requests_data)
-
-    # ── Backlog Items ──
-    # Confluent-specific GTM stages
-    STAGES = ["Pipeline Generation", "Deal Execution", "Onboarding & Adoption", "Expansion & Renewal"]
-    TEAMS = ["Sales (SDR)", "Sales (AE)", "Customer Success", "RevOps", "Marketing Ops", "Sales (Manager)"]
-    URGENCIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-    STATUSES = ["INTAKE", "SCOPING", "IN BUILD", "QA", "DEPLOYED", "MEASURING"]
-
-    backlog_data = [
-        ("BLG-001", "REQ-001", "Cloud Churn Early Warning", "Sarah Chen", "AE", "Expansion & Renewal", "Strategic", "AI Agent", 9, "In Build", "Maya (Data Sci)", "10 hrs/week"),
-        ("BLG-002", "REQ-002", "Automated QBR Generator", "James Rodriguez", "Customer Success", "Onboarding & Adoption", "Medium", "Workflow Automation", 8, "Intake", None, "12 hrs/week"),
-        ("BLG-003", "REQ-003", "Real-time Deal Health Scorer", "Priya Patel", "RevOps", "Deal Execution", "Medium", "AI Agent", 7, "Intake", None, "8 hrs/week"),
-        ("BLG-004", "REQ-004", "Cloud Pulse Outreach Agent", "Mike Ross", "SDR", "Pipeline Generation", "Quick Win", "AI Agent", 8, "Deployed", "Alex (AI Eng)", "15 hrs/week"),
-        ("BLG-005", "REQ-005", "Forecast Risk Detector", "Elena Gomez", "Sales (Manager)", "Deal Execution", "Strategic", "AI Agent", 9, "Scoping", "Maya (Data Sci)", "10 hrs/week"),
-        ("BLG-006", "REQ-006", "Auto Success Plan Generator", "David Kim", "Customer Success", "Onboarding & Adoption", "Medium", "AI Agent", 7, "QA", "Alex (AI Eng)", "7 hrs/week"),
-        ("BLG-007", "REQ-007", "Territory Data in Motion Map", "Rachel Foster", "Sales (Manager)", "Expansion & Renewal", "Medium", "Workflow Automation", 6, "Intake", None, "6 hrs/week"),
-        ("BLG-008", "REQ-008", "CRM Cloud Data Hygiene", "Alex Nguyen", "RevOps", "Pipeline Generation", "Quick Win", "Data Fix", 5, "Intake", None, "5 hrs/week"),
-    ]
-
-    con.executemany("""
-        INSERT INTO backlog_items (id, request_id, title, requester_name, requester_team, gtm_stage, complexity, approach, priority_score, status, assigned_to, estimated_time_savings)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, backlog_data)
-
-    # ── Impact Metrics (for deployed items) ──
-    # Historical ROI Data for Impact Tracker
-    roi_data = [
-        ("IMP-001", "REQ-004", "Cloud Pulse Outreach Agent", "DEPLOYED", 20.0, 4.0, 0.88, 11000.0, 2),
-        ("IMP-002", "REQ-001", "Cloud Churn Early Warning", "MEASURING", 15.0, 3.0, 0.78, 8500.0, 3),
-        ("IMP-003", "REQ-006", "Auto Success Plan Generator", "QA", 22.0, 5.0, 0.0, 0.0, 0),
-    ]
-
-    con.executemany("""
-        INSERT INTO impact_metrics (id, request_id, title, status, manual_time_before, ai_time_after, adoption_rate, roi_estimate, weeks_deployed)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, roi_data)
-
-    # ── Prompt Versions ──
-    prompt_data = [
-        ("PV-001", "REQ-001", 1, "Research this lead and provide key talking points for an SDR.", "Company: Acme Corp, Industry: SaaS, Key Points: Series B funding, expanding to EMEA, uses AWS...", 6.5),
-        ("PV-002", "REQ-001", 2, "You are an SDR research assistant. Given a lead's company name and industry, provide: 1) Company overview, 2) Recent news, 3) Tech stack signals, 4) Recommended talking points.", "**Acme Corp — SDR Research Brief**\n\n1. Overview: Mid-market SaaS...", 8.2),
-        ("PV-003", "REQ-002", 1, "Analyze this customer's engagement data and predict churn risk.", "Based on the engagement signals, this account shows moderate risk...", 5.8),
-        ("PV-004", "REQ-002", 2, "You are a customer health analyst. Given an account's engagement metrics (login frequency, support tickets, feature adoption, NPS), produce a risk score (1-10) and recommended actions.", "**Churn Risk Assessment**\n\nRisk Score: 7/10\nKey Signals: Login frequency down 40%...", 7.9),
-    ]
-
-    con.executemany("""
-        INSERT INTO prompt_versions (id, request_id, version, prompt_text, response_text, quality_score)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, prompt_data)
-
-    # ── Audit Log ──
-    audit_data = [
-        ("AUD-001", "2026-02-10 09:15:00", "triage", "System (AI)", "REQ-001", "AI triage completed for SDR lead research request — classified as Medium complexity, AI Agent approach", None, None),
-        ("AUD-002", "2026-02-10 09:16:00", "intake_received", "Sarah Chen", "REQ-001", "New intake request submitted by Sales (SDR) team — 15 hrs/week manual effort reported", None, None),
-        ("AUD-003", "2026-02-11 14:30:00", "triage", "System (AI)", "REQ-002", "AI triage completed for churn early-warning request — classified as Strategic complexity, AI Agent approach", None, None),
-        ("AUD-004", "2026-02-12 10:00:00", "blueprint_generated", "System (AI)", "REQ-001", "Workflow blueprint auto-generated for AI Lead Research Assistant — 4 steps, 2 integrations", None, None),
-        ("AUD-005", "2026-02-12 16:45:00", "prompt_tested", "Alex (AI Eng)", "REQ-001", "Prompt v2 tested in Prompt Lab — quality score improved from 6.5 to 8.2", "Research this lead...", "SDR Research Brief generated"),
-        ("AUD-006", "2026-02-13 11:00:00", "qa_completed", "Alex (AI Eng)", "REQ-003", "QA checks passed for CRM Data Hygiene Bot — 4/4 checks passed, no PII exposure detected", None, None),
-        ("AUD-007", "2026-02-13 14:20:00", "status_change", "Jordan (Ops)", "REQ-003", "CRM Data Hygiene Bot moved from QA → Deployed", None, None),
-        ("AUD-008", "2026-02-14 09:00:00", "deployment", "Alex (AI Eng)", "REQ-003", "CRM Data Hygiene Bot deployed to production — rollout to RevOps team (12 users)", None, None),
-        ("AUD-009", "2026-02-14 15:30:00", "prompt_tested", "Maya (Data Sci)", "REQ-002", "Prompt v2 tested for churn prediction — quality score improved from 5.8 to 7.9", None, None),
-        ("AUD-010", "2026-02-15 10:15:00", "qa_completed", "Alex (AI Eng)", "REQ-004", "QA checks for AI Follow-Up Drafter — 3/4 passed, 1 warning (tone consistency)", None, None),
-        ("AUD-011", "2026-02-16 08:45:00", "status_change", "Alex (AI Eng)", "REQ-001", "AI Lead Research Assistant moved from In Build → QA", None, None),
-        ("AUD-012", "2026-02-17 09:00:00", "compliance_review", "Legal Review", "REQ-002", "Data usage compliance review initiated for churn model — customer engagement data requires DPA verification", None, None),
-    ]
-
-    con.executemany("""
-        INSERT INTO audit_log (id, timestamp, event_type, actor, request_id, description, input_snapshot, output_snapshot)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, audit_data)
-
-    # ── QA Checks ──
-    qa_data = [
-        ("QA-001", "REQ-003", "CRM Data Hygiene Bot", "PII Detection", "pass", "No PII fields exposed in AI-generated outputs. Email and phone fields masked correctly.", "2026-02-13 10:30:00"),
-        ("QA-002", "REQ-003", "CRM Data Hygiene Bot", "Hallucination Check", "pass", "Output field corrections validated against source CRM data — 98.5% accuracy.", "2026-02-13 10:32:00"),
-        ("QA-003", "REQ-003", "CRM Data Hygiene Bot", "Prompt Injection", "pass", "Adversarial prompt inputs rejected correctly. No instruction override detected.", "2026-02-13 10:34:00"),
-        ("QA-004", "REQ-003", "CRM Data Hygiene Bot", "Data Leakage", "pass", "Cross-account data isolation verified — no data bleed between tenant records.", "2026-02-13 10:36:00"),
-        ("QA-005", "REQ-004", "AI Follow-Up Drafter", "PII Detection", "pass", "Customer names used appropriately. No SSN, financial, or health data in outputs.", "2026-02-15 10:00:00"),
-        ("QA-006", "REQ-004", "AI Follow-Up Drafter", "Hallucination Check", "pass", "Follow-up content matches meeting notes context — no fabricated commitments.", "2026-02-15 10:02:00"),
-        ("QA-007", "REQ-004", "AI Follow-Up Drafter", "Tone Consistency", "warning", "Tone slightly varies between formal and casual across generated drafts. Recommend adding style guide constraint.", "2026-02-15 10:04:00"),
-        ("QA-008", "REQ-004", "AI Follow-Up Drafter", "Prompt Injection", "pass", "Adversarial inputs handled correctly. System prompt boundaries maintained.", "2026-02-15 10:06:00"),
-        ("QA-009", "REQ-001", "AI Lead Research Assistant", "Bias Detection", "warning", "Minor geographic bias detected — US-based companies receive 15% more detail. Recommend balancing training examples.", "2026-02-16 14:00:00"),
-        ("QA-010", "REQ-001", "AI Lead Research Assistant", "PII Detection", "pass", "Lead research outputs contain only company-level public data. No individual PII surfaced.", "2026-02-16 14:02:00"),
-    ]
-
-    con.executemany("""
-        INSERT INTO qa_checks (id, request_id, workflow_title, check_name, status, details, run_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, qa_data)
-
-
-def initialize_database(db_path: str = DB_PATH) -> duckdb.DuckDBPyConnection:
-    """Create tables and seed data. Returns the connection."""
-    con = get_connection(db_path)
-    create_tables(con)
-    seed_data(con)
+    # One commit for the whole seed, and no half-seeded database if a block fails
+    with transaction(con):
+        _load_seed(con)
+
+
+def _load_seed_files(con: duckdb.DuckDBPyConnection):
+    """Copy every seed table in from its parquet snapshot."""
+    for table in SEED_COLUMNS:
+        con.execute(_SQL_INSERT_PARQUET[table], [str(_seed_file(table))])
+
+
+def export_seed_files(out_dir: Path = SEED_DIR):
+    """Write the literal seed rows below to one parquet file per table."""
+    import duckdb
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+    try:
+        create_tables(con)
+        _insert_seed_rows(con)
+        for table, columns in SEED_COLUMNS.items():
+            path = str(out_dir / f"{table}.parquet").replace("'", "''")
+            con.execute(f"COPY (SELECT {', '.join(columns)} FROM {table} ORDER BY {_load_order(table)}) TO '{path}' (FORMAT PARQUET)")
+    finally:
+        con.close()
+
+
+# Timestamps are parsed here once so DuckDB receives typed TIMESTAMP values, not text
+_TS = datetime.fromisoformat
+
+# ── Intake Requests ──
+_INTAKE_ROWS = [
+    ("REQ-001", "Sarah Chen", "AE", "Cloud consumption-based churn early warning system using real-time engagement signals.", "Expansion & Renewal", "CRITICAL", "IN BUILD", _TS("2026-02-15 09:00:00")),
+    ("REQ-002", "James Rodriguez", "Customer Success", "Automated QBR data aggregation from data streaming sources for enterprise customers.", "Onboarding & Adoption", "HIGH", "INTAKE", _TS("2026-02-16 10:30:00")),
+    ("REQ-003", "Priya Patel", "RevOps", "Real-time deal health scoring using activity signals and data motion patterns.", "Deal Execution", "MEDIUM", "INTAKE", _TS("2026-02-16 11:45:00")),
+    ("REQ-004", "Mike Ross", "SDR", "AI-powered personalized outreach agent for high-intent 'Cloud Pulse' signals.", "Pipeline Generation", "HIGH", "DEPLOYED", _TS("2026-02-14 14:20:00")),
+    ("REQ-005", "Elena Gomez", "Sales (Manager)", "Automated forecast risk detection based on deal velocity and data stream signals.", "Deal Execution", "CRITICAL", "SCOPING", _TS("2026-02-17 08:30:00")),
+    ("REQ-006", "David Kim", "Customer Success", "Automatic success plan generation based on platform usage bottlenecks.", "Onboarding & Adoption", "MEDIUM", "QA", _TS("2026-02-17 10:15:00")),
+    ("REQ-007", "Rachel Foster", "Sales (Manager)", "Territory 'Data in Motion' map for identifying real-time expansion pockets.", "Expansion & Renewal", "MEDIUM", "INTAKE", _TS("2026-02-17 14:00:00")),
+    ("REQ-008", "Alex Nguyen", "RevOps", "Automated CRM data hygiene scanning for cloud-native record attributes.", "Pipeline Generation", "LOW", "INTAKE", _TS("2026-02-17 15:30:00"))
+]
+
+# ── Backlog Items ──
+# Confluent-specific GTM stages
+STAGES = ["Pipeline Generation", "Deal Execution", "Onboarding & Adoption", "Expansion & Renewal"]
+TEAMS = ["Sales (SDR)", "Sales (AE)", "Customer Success", "RevOps", "Marketing Ops", "Sales (Manager)"]
+URGENCIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+STATUSES = ["INTAKE", "SCOPING", "IN BUILD", "QA", "DEPLOYED", "MEASURING"]
+
+_BACKLOG_ROWS = [
+    ("BLG-001", "REQ-001", "Cloud Churn Early Warning", "Sarah Chen", "AE", "Expansion & Renewal", "Strategic", "AI Agent", 9, "In Build", "Maya (Data Sci)", "10 hrs/week"),
+    ("BLG-002", "REQ-002", "Automated QBR Generator", "James Rodriguez", "Customer Success", "Onboarding & Adoption", "Medium", "Workflow Automation", 8, "Intake", None, "12 hrs/week"),
+    ("BLG-003", "REQ-003", "Real-time Deal Health Scorer", "Priya Patel", "RevOps", "Deal Execution", "Medium", "AI Agent", 7, "Intake", None, "8 hrs/week"),
+    ("BLG-004", "REQ-004", "Cloud Pulse Outreach Agent", "Mike Ross", "SDR", "Pipeline Generation", "Quick Win", "AI Agent", 8, "Deployed", "Alex (AI Eng)", "15 hrs/week"),
+    ("BLG-005", "REQ-005", "Forecast Risk Detector", "Elena Gomez", "Sales (Manager)", "Deal Execution", "Strategic", "AI Agent", 9, "Scoping", "Maya (Data Sci)", "10 hrs/week"),
+    ("BLG-006", "REQ-006", "Auto Success Plan Generator", "David Kim", "Customer Success", "Onboarding & Adoption", "Medium", "AI Agent", 7, "QA", "Alex (AI Eng)", "7 hrs/week"),
+    ("BLG-007", "REQ-007", "Territory Data in Motion Map", "Rachel Foster", "Sales (Manager)", "Expansion & Renewal", "Medium", "Workflow Automation", 6, "Intake", None, "6 hrs/week"),
+    ("BLG-008", "REQ-008", "CRM Cloud Data Hygiene", "Alex Nguyen", "RevOps", "Pipeline Generation", "Quick Win", "Data Fix", 5, "Intake", None, "5 hrs/week"),
+]
+
+# ── Impact Metrics (for deployed items) ──
+# Historical ROI Data for Impact Tracker
+_IMPACT_ROWS = [
+    ("IMP-001", "REQ-004", "Cloud Pulse Outreach Agent", "DEPLOYED", 20.0, 4.0, 0.88, 11000.0, 2),
+    ("IMP-002", "REQ-001", "Cloud Churn Early Warning", "MEASURING", 15.0, 3.0, 0.78, 8500.0, 3),
+    ("IMP-003", "REQ-006", "Auto Success Plan Generator", "QA", 22.0, 5.0, 0.0, 0.0, 0),
+]
+
+# ── Prompt Versions ──
+_PROMPT_ROWS = [
+    ("PV-001", "REQ-001", 1, "Research this lead and provide key talking points for an SDR.", "Company: Acme Corp, Industry: SaaS, Key Points: Series B funding, expanding to EMEA, uses AWS...", 6.5),
+    ("PV-002", "REQ-001", 2, "You are an SDR research assistant. Given a lead's company name and industry, provide: 1) Company overview, 2) Recent news, 3) Tech stack signals, 4) Recommended talking points.", "**Acme Corp — SDR Research Brief**\n\n1. Overview: Mid-market SaaS...", 8.2),
+    ("PV-003", "REQ-002", 1, "Analyze this customer's engagement data and predict churn risk.", "Based on the engagement signals, this account shows moderate risk...", 5.8),
+    ("PV-004", "REQ-002", 2, "You are a customer health analyst. Given an account's engagement metrics (login frequency, support tickets, feature adoption, NPS), produce a risk score (1-10) and recommended actions.", "**Churn Risk Assessment**\n\nRisk Score: 7/10\nKey Signals: Login frequency down 40%...", 7.9),
+]
+
+# ── Audit Log ──
+_AUDIT_ROWS = [
+    ("AUD-001", _TS("2026-02-10 09:15:00"), "triage", "System (AI)", "REQ-001", "AI triage completed for SDR lead research request — classified as Medium complexity, AI Agent approach", None, None),
+    ("AUD-002", _TS("2026-02-10 09:16:00"), "intake_received", "Sarah Chen", "REQ-001", "New intake request submitted by Sales (SDR) team — 15 hrs/week manual effort reported", None, None),
+    ("AUD-003", _TS("2026-02-11 14:30:00"), "triage", "System (AI)", "REQ-002", "AI triage completed for churn early-warning request — classified as Strategic complexity, AI Agent approach", None, None),
+    ("AUD-004", _TS("2026-02-12 10:00:00"), "blueprint_generated", "System (AI)", "REQ-001", "Workflow blueprint auto-generated for AI Lead Research Assistant — 4 steps, 2 integrations", None, None),
+    ("AUD-005", _TS("2026-02-12 16:45:00"), "prompt_tested", "Alex (AI Eng)", "REQ-001", "Prompt v2 tested in Prompt Lab — quality score improved from 6.5 to 8.2", "Research this lead...", "SDR Research Brief generated"),
+    ("AUD-006", _TS("2026-02-13 11:00:00"), "qa_completed", "Alex (AI Eng)", "REQ-003", "QA checks passed for CRM Data Hygiene Bot — 4/4 checks passed, no PII exposure detected", None, None),
+    ("AUD-007", _TS("2026-02-13 14:20:00"), "status_change", "Jordan (Ops)", "REQ-003", "CRM Data Hygiene Bot moved from QA → Deployed", None, None),
+    ("AUD-008", _TS("2026-02-14 09:00:00"), "deployment", "Alex (AI Eng)", "REQ-003", "CRM Data Hygiene Bot deployed to production — rollout to RevOps team (12 users)", None, None),
+    ("AUD-009", _TS("2026-02-14 15:30:00"), "prompt_tested", "Maya (Data Sci)", "REQ-002", "Prompt v2 tested for churn prediction — quality score improved from 5.8 to 7.9", None, None),
+    ("AUD-010", _TS("2026-02-15 10:15:00"), "qa_completed", "Alex (AI Eng)", "REQ-004", "QA checks for AI Follow-Up Drafter — 3/4 passed, 1 warning (tone consistency)", None, None),
+    ("AUD-011", _TS("2026-02-16 08:45:00"), "status_change", "Alex (AI Eng)", "REQ-001", "AI Lead Research Assistant moved from In Build → QA", None, None),
+    ("AUD-012", _TS("2026-02-17 09:00:00"), "compliance_review", "Legal Review", "REQ-002", "Data usage compliance review initiated for churn model — customer engagement data requires DPA verification", None, None),
+]
+
+# ── QA Checks ──
+_QA_ROWS = [
+    ("QA-001", "REQ-003", "CRM Data Hygiene Bot", "PII Detection", "pass", "No PII fields exposed in AI-generated outputs. Email and phone fields masked correctly.", _TS("2026-02-13 10:30:00")),
+    ("QA-002", "REQ-003", "CRM Data Hygiene Bot", "Hallucination Check", "pass", "Output field corrections validated against source CRM data — 98.5% accuracy.", _TS("2026-02-13 10:32:00")),
+    ("QA-003", "REQ-003", "CRM Data Hygiene Bot", "Prompt Injection", "pass", "Adversarial prompt inputs rejected correctly. No instruction override detected.", _TS("2026-02-13 10:34:00")),
+    ("QA-004", "REQ-003", "CRM Data Hygiene Bot", "Data Leakage", "pass", "Cross-account data isolation verified — no data bleed between tenant records.", _TS("2026-02-13 10:36:00")),
+    ("QA-005", "REQ-004", "AI Follow-Up Drafter", "PII Detection", "pass", "Customer names used appropriately. No SSN, financial, or health data in outputs.", _TS("2026-02-15 10:00:00")),
+    ("QA-006", "REQ-004", "AI Follow-Up Drafter", "Hallucination Check", "pass", "Follow-up content matches meeting notes context — no fabricated commitments.", _TS("2026-02-15 10:02:00")),
+    ("QA-007", "REQ-004", "AI Follow-Up Drafter", "Tone Consistency", "warning", "Tone slightly varies between formal and casual across generated drafts. Recommend adding style guide constraint.", _TS("2026-02-15 10:04:00")),
+    ("QA-008", "REQ-004", "AI Follow-Up Drafter", "Prompt Injection", "pass", "Adversarial inputs handled correctly. System prompt boundaries maintained.", _TS("2026-02-15 10:06:00")),
+    ("QA-009", "REQ-001", "AI Lead Research Assistant", "Bias Detection", "warning", "Minor geographic bias detected — US-based companies receive 15% more detail. Recommend balancing training examples.", _TS("2026-02-16 14:00:00")),
+    ("QA-010", "REQ-001", "AI Lead Research Assistant", "PII Detection", "pass", "Lead research outputs contain only company-level public data. No individual PII surfaced.", _TS("2026-02-16 14:02:00")),
+]
+
+# Low-cardinality columns whose repeated values are worth sharing as one string object
+_INTERNED_COLUMNS = {
+    "request_id", "requester_name", "requester_team", "title", "workflow_title", "gtm_stage",
+    "complexity", "approach", "urgency", "status", "assigned_to", "estimated_time_savings",
+    "event_type", "actor", "check_name",
+}
+
+
+def _column(name: str, values: tuple) -> list:
+    if name not in _INTERNED_COLUMNS:
+        return list(values)
+    return [sys.intern(v) if isinstance(v, str) else v for v in values]
+
+
+# Column-major copies of the rows above, built once at import so each load just wraps them in a frame
+SEED_DATA: Dict[str, Dict[str, list]] = {
+    table: {name: _column(name, values) for name, values in zip(SEED_COLUMNS[table], zip(*rows))}
+    for table, rows in (
+        ("intake_requests", _INTAKE_ROWS),
+        ("backlog_items", _BACKLOG_ROWS),
+        ("impact_metrics", _IMPACT_ROWS),
+        ("prompt_versions", _PROMPT_ROWS),
+        ("audit_log", _AUDIT_ROWS),
+        ("qa_checks", _QA_ROWS),
+    )
+}
+
+
+def _insert_seed_rows(con: duckdb.DuckDBPyConnection):
+    """Insert every seed table's rows; the caller owns the transaction."""
+    for table in SEED_COLUMNS:
+        _bulk_load(con, table)
+
+
+def build_seed_file(path: Path = SEED_FILE):
+    """Build a pristine, fully seeded database file for fresh installs to copy."""
+    import duckdb
+
+    path.unlink(missing_ok=True)
+    con = duckdb.connect(str(path))
+    try:
+        create_tables(con)
+        seed_data(con)
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+
+
+def _attach(db_path: str, name: str) -> duckdb.DuckDBPyConnection:
+    """ATTACH db_path to the shared in-memory instance and return a cursor using it by default."""
+    global _attach_host
+    with _connections_lock:
+        if _attach_host is None:
+            _attach_host = _connect(":memory:", DUCK_THREADS, DUCK_MEMORY_LIMIT)
+        shared = _attach_host
+    path = db_path.replace("'", "''")
+    shared.execute(f"ATTACH '{path}' AS {name}")
+    cur = shared.cursor()
+    cur.execute(f"USE {name}")
+    return cur
+
+
+def detach_database(name: str):
+    """DETACH a database attached by initialize_database(..., attach_as=name)."""
+    if _attach_host is not None:
+        _attach_host.execute(f"DETACH {name}")
+
+
+def initialize_database(db_path: str = DB_PATH, *, attach_as: Optional[str] = None) -> duckdb.DuckDBPyConnection:
+    """Create tables and seed data. Returns a cursor on the shared connection.
+
+    With attach_as, db_path is attached under that name to one process-wide in-memory
+    instance instead of getting its own, so tests and CI runs that seed many throwaway
+    databases skip per-instance startup. The returned cursor uses it as its default
+    database; close the cursor and call detach_database(attach_as) when done.
+    """
+    # Fresh install: copying the prebuilt file beats creating and seeding from scratch
+    copied = not db_path.startswith(":memory:") and not Path(db_path).exists() and SEED_FILE.exists()
+    if copied:
+        shutil.copyfile(SEED_FILE, db_path)
+
+    if attach_as:
+        con = _attach(db_path, attach_as)
+    else:
+        con = get_connection(db_path, threads=DUCK_THREADS, memory_limit=DUCK_MEMORY_LIMIT)
+    if copied:
+        # The prebuilt file may predate newer tables, enums or indexes; add whatever is missing
+        create_tables(con)
+        return con
+
+    if _is_seeded(con):
+        create_tables(con)
+        return con
+
+    # First launch: schema and seed rows land in one transaction with a single commit
+    with transaction(con):
+        create_tables(con)
+        _load_seed(con)
+    # Fold the WAL into the main file so first reads scan committed blocks directly
+    con.execute("CHECKPOINT")
     return con
 
 
 if __name__ == "__main__":
+    if "--export" in sys.argv[1:]:
+        export_seed_files()
+        print(f"✅ Seed snapshots written to {SEED_DIR}")
+        sys.exit(0)
+    if "--build-seed-file" in sys.argv[1:]:
+        build_seed_file()
+        print(f"✅ Seed database written to {SEED_FILE}")
+        sys.exit(0)
+
     print("Initializing GTM AI Operations Hub database...")
     con = initialize_database()
-    count = con.execute("SELECT COUNT(*) FROM intake_requests").fetchone()[0]
-    audit_count = con.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+    count, audit_count = con.execute(
+        "SELECT (SELECT COUNT(*) FROM intake_requests), (SELECT COUNT(*) FROM audit_log)"
+    ).fetchone()
     print(f"✅ Database ready — {count} intake requests, {audit_count} audit entries seeded")
-    con.close()
+    close_connection()
 
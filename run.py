@@ -3,17 +3,28 @@ GTM AI Operations Hub — Application Launcher
 Run: python run.py
 """
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables from .env BEFORE importing the app
-load_dotenv()
+if __name__ == "__main__":
+    # dotenv and uvicorn are only needed when actually launching, so importing this module stays cheap
+    from dotenv import load_dotenv
 
-import uvicorn
+    # Load environment variables from .env BEFORE importing the app
+    load_dotenv()
 
-if __name__ == "__main__":
+    import uvicorn
+
+    dev = os.getenv("ENV") == "dev"
+    # uvicorn[standard] ships uvloop (not on Windows) and the httptools C parser
+    fast_loop = sys.platform != "win32"
     uvicorn.run(
         "webapp.app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        # The file watcher is a dev convenience; it costs a supervisor process
+        reload=dev,
+        loop="uvloop" if fast_loop else "auto",
+        http="httptools",
+        # One worker: DuckDB lets a single process hold the database file for writing
+        workers=1,
     )
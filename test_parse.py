@@ -1,30 +1,57 @@
-import requests
-import json
-import time
+import asyncio
+import math
+import httpx
+import orjson
 
 url = "https://api-bcbe5a.stack.tryrelevance.com/latest/agents/trigger"
 headers = {
     "Authorization": "12bdbde1-399a-4bba-9955-304cebce6cad:sk-Y2YxZjc0MGEtYjViMy00Zjc2LTljNGItYzU3ZTY5NmUzZDNm",
     "Content-Type": "application/json"
 }
+# Longest wait between polls, whether from our backoff or the server's Retry-After
+MAX_DELAY = 2.0
+
 payload = {
     "message": {"role": "user", "content": "Hello!"},
     "agent_id": "f6824156-1540-41bb-853c-d22aab2cc075"
 }
 
-resp = requests.post(url, headers=headers, json=payload).json()
-job_info = resp.get("job_info", {})
-job_id = job_info.get("job_id")
-studio_id = job_info.get("studio_id")
 
-poll_url = f"https://api-bcbe5a.stack.tryrelevance.com/latest/studios/{studio_id}/async_poll/{job_id}"
-while True:
-    time.sleep(2)
-    poll_resp = requests.get(poll_url, headers=headers).json()
-    updates = poll_resp.get("updates", [])
-    if any(u.get("type") in ["chain-success", "chain-failed"] for u in updates):
-        for update in updates:
-            if update.get("type") == "chain-success":
-                print("OUTPUT:")
-                print(json.dumps(update.get("output"), indent=2))
-        break
+async def main():
+    # One kept-alive connection for the trigger and every poll, instead of a TLS handshake each time
+    async with httpx.AsyncClient(headers=headers, limits=httpx.Limits(max_connections=1), timeout=60) as client:
+        # Serialized once with orjson; the client already sends Content-Type: application/json
+        resp = orjson.loads((await client.post(url, content=orjson.dumps(payload))).content)
+        job_info = resp.get("job_info", {})
+        job_id = job_info.get("job_id")
+        studio_id = job_info.get("studio_id")
+
+        poll_url = f"https://api-bcbe5a.stack.tryrelevance.com/latest/studios/{studio_id}/async_poll/{job_id}"
+        # Poll quickly at first so fast jobs return early, backing off to MAX_DELAY (sooner if the server asks)
+        delay = 0.25
+        while True:
+            # Awaiting instead of sleeping frees the event loop to drive other polls meanwhile
+            await asyncio.sleep(delay)
+            poll = await client.get(poll_url)
+            body = poll.content
+            # In-progress polls can't hold a terminal event, so skip parsing them on a byte scan
+            if b"chain-success" in body or b"chain-failed" in body:
+                updates = orjson.loads(body).get("updates", [])
+                if any(u.get("type") in ["chain-success", "chain-failed"] for u in updates):
+                    for update in updates:
+                        if update.get("type") == "chain-success":
+                            print("OUTPUT:")
+                            print(orjson.dumps(update.get("output"), option=orjson.OPT_INDENT_2).decode())
+                    break
+            # Honor a sane Retry-After (clamped to MAX_DELAY); otherwise keep backing off
+            try:
+                retry_after = float(poll.headers["Retry-After"])
+                if not math.isfinite(retry_after) or retry_after < 0:
+                    raise ValueError(retry_after)
+                delay = min(retry_after, MAX_DELAY)
+            except (KeyError, ValueError):
+                delay = min(delay * 2, MAX_DELAY)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,144 +2,395 @@
 FastAPI Web Application — GTM AI Operations Hub
 Routes: Overview, Intake, Backlog, Builder, Impact, AI Status
 """
-import json
-import uuid
+import asyncio
+import functools
+import hashlib
+import logging
+import logging.handlers
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
 import duckdb
+import jinja2
+import orjson
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from agent.agent import GTMOpsAgent
 from agent.relevance_handler import RelevanceAgentHandler
-from data.seed import initialize_database, DB_PATH
+from data.seed import ENUMS, initialize_database, close_connection, transaction
 
 # ─────────── App Setup ───────────
 
-app = FastAPI(title="GTM AI Operations Hub")
-app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
-templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
+_TEMPLATE_DIR = Path(__file__).parent / "templates"
+_DEV = os.getenv("ENV") == "dev"
+
+# Compiled templates are kept for the process (and their bytecode on disk across restarts);
+# only dev mode re-checks template files for edits
+templates = Jinja2Templates(env=jinja2.Environment(
+    loader=jinja2.FileSystemLoader(_TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=_DEV,
+    cache_size=-1,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(),
+))
+
+# Pages render through MiniJinja (Rust) by default; TEMPLATE_ENGINE=jinja2 falls back to Jinja2
+_minijinja = None
+if os.getenv("TEMPLATE_ENGINE", "minijinja") == "minijinja":
+    import minijinja
+
+    _minijinja = minijinja.Environment(
+        loader=minijinja.load_from_path(str(_TEMPLATE_DIR)),
+        reload_before_render=_DEV,
+    )
+
+
+def render(name: str, context: dict) -> HTMLResponse:
+    """Render a page template with the configured engine (a drop-in for templates.TemplateResponse)."""
+    if _minijinja is None:
+        return templates.TemplateResponse(name, context)
+    return HTMLResponse(_minijinja.render_template(name, **context))
+
+# App logs ("gtm.*") go through a queue; a background listener does the stream I/O
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_gtm_logger = logging.getLogger("gtm")
+_gtm_logger.setLevel(logging.INFO)
+_gtm_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_gtm_logger.propagate = False
 
 # Initialize agents and database
 agent = GTMOpsAgent()
 relevance_agent = RelevanceAgentHandler()
-_db_initialized = False
 
 
-def get_db() -> duckdb.DuckDBPyConnection:
-    """Get a database connection, initializing on first call."""
-    global _db_initialized
-    if not _db_initialized:
-        initialize_database()
-        _db_initialized = True
-    return duckdb.connect(DB_PATH)
+class CursorPool:
+    """Pre-warmed cursors on one DuckDB connection, checked out per request and handed back."""
+
+    ACQUIRE_TIMEOUT = 2.0
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, size: int):
+        self._con = con
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        for _ in range(size):
+            cur = con.cursor()
+            cur.execute("SELECT 1").fetchall()
+            self._idle.put(cur)
+
+    @contextmanager
+    def acquire(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        # Called from run_db's worker threads, so waiting briefly for a returned cursor is fine;
+        # only a pool that stays exhausted opens a spare
+        try:
+            cur = self._idle.get(timeout=self.ACQUIRE_TIMEOUT)
+        except queue.Empty:
+            cur = self._con.cursor()
+        try:
+            yield cur
+        finally:
+            try:
+                self._idle.put_nowait(cur)
+            except queue.Full:
+                cur.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+T = TypeVar("T")
+
+# Opened once at startup; requests only ever borrow cursors from the pool
+_pool: Optional[CursorPool] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the background log writer, compile the templates and open (and if needed seed) the
+    database; on shutdown release the agent's async HTTP client, close the database and flush
+    queued logs."""
+    global _pool
+    _log_listener.start()
+    # Compile every Jinja2 template now rather than on the first request to each page
+    if _minijinja is None:
+        for name in templates.env.list_templates():
+            templates.env.get_template(name)
+    _pool = CursorPool(initialize_database(), int(os.getenv("DUCK_POOL", "8")))
+    try:
+        yield
+    finally:
+        await agent.aclose()
+        _pool.close()
+        _pool = None
+        close_connection()
+        _log_listener.stop()
+
+
+app = FastAPI(title="GTM AI Operations Hub", lifespan=lifespan)
+app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
+
+
+def get_db():
+    """Borrow a pooled cursor on the shared database connection: `with get_db() as con:`.
+
+    May wait for a free cursor, so call it off the event loop (run_db does).
+    """
+    return _pool.acquire()
+
+
+# DuckDB aborts concurrent writes to the same row ("Conflict on update"), so writers take turns
+_write_lock = threading.Lock()
+
+
+async def run_db(fn: Callable[..., T], *args, write: bool = False) -> T:
+    """Run fn(con, *args) with a pooled cursor on a worker thread, keeping DuckDB off the event loop."""
+    def call():
+        with get_db() as con:
+            if not write:
+                return fn(con, *args)
+            with _write_lock:
+                return fn(con, *args)
+    result = await asyncio.to_thread(call)
+    if write:
+        _invalidate_dashboards()
+    return result
+
+
+# Dashboard aggregates change on human timescales, so loads within a few seconds of each
+# other share one result. Only touched from the event loop, so no lock is needed.
+_DASHBOARD_TTL = 5.0
+_dashboard_cache: Dict[Callable, Tuple[float, Dict[str, Any]]] = {}
+_dashboard_generation = 0
+
+
+def _invalidate_dashboards():
+    global _dashboard_generation
+    _dashboard_cache.clear()
+    _dashboard_generation += 1
+
+
+async def cached_dashboard(fn: Callable[[duckdb.DuckDBPyConnection], Dict[str, Any]]) -> Dict[str, Any]:
+    """run_db(fn), reused for _DASHBOARD_TTL seconds or until the next write."""
+    entry = _dashboard_cache.get(fn)
+    if entry is not None and time.monotonic() - entry[0] < _DASHBOARD_TTL:
+        return entry[1]
+    generation = _dashboard_generation
+    data = await run_db(fn)
+    # A write that landed while we were querying may not be reflected; don't keep it
+    if generation == _dashboard_generation:
+        _dashboard_cache[fn] = (time.monotonic(), data)
+    return data
+
+
+def rows_as_dicts(cur: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
+    """Fetch an executed query's rows as column-name dicts, without a DataFrame in between."""
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def _short_id(prefix: str) -> str:
+    """A record id like REQ-3FA9C1 (6 random hex digits from one urandom read)."""
+    return f"{prefix}-{secrets.token_hex(3).upper()}"
+
+
+def _now_str() -> str:
+    """The current local time as 'YYYY-MM-DD HH:MM:SS'."""
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+# Backlog board columns, left to right
+KANBAN_COLUMNS = ENUMS["backlog_status_t"]
+
+
+# Hot write statements, built once at import instead of per request
+_SQL_INSERT_INTAKE = """
+    INSERT INTO intake_requests
+    (id, requester_name, requester_team, pain_point, workflow_stage,
+     manual_time_hours, urgency, created_at, gtm_stage, complexity,
+     approach, priority_score, triage_summary, requirements_json, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'Intake')
+"""
+_SQL_INSERT_BACKLOG = """
+    INSERT INTO backlog_items
+    (id, request_id, title, requester_name, requester_team, gtm_stage,
+     complexity, approach, priority_score, status, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Intake', ?, ?)
+"""
+_SQL_UPDATE_STATUS = "UPDATE backlog_items SET status = ?, updated_at = ? WHERE id = ?"
+_SQL_CACHE_TRIAGE = "INSERT OR IGNORE INTO llm_cache (key, triage, requirements) VALUES (?, ?, ?)"
 
 
 # ─────────── API Endpoints ───────────
 
 
+# The status widget polls; one round of upstream pings answers every poll for a few seconds
+_HEALTH_TTL = 10.0
+_health: Dict[str, Any] = {"ts": 0.0, "result": None}
+_health_task: Optional[asyncio.Task] = None
+
+
+async def _ping_services() -> Dict[str, Any]:
+    # Both checks are blocking HTTP calls: run them side by side off the event loop
+    llm_status, relevance_status = await asyncio.gather(
+        asyncio.to_thread(agent.check_health),
+        asyncio.to_thread(relevance_agent.check_health),
+    )
+    return {"llm": llm_status, "relevance": relevance_status}
+
+
 @app.get("/api/ai-status")
 async def ai_status():
     """Check AI/LLM connection health by pinging HuggingFace and Relevance AI."""
-    llm_status = agent.check_health()
-    relevance_status = relevance_agent.check_health()
-    return JSONResponse({
-        "llm": llm_status,
-        "relevance": relevance_status
-    })
+    global _health_task
+    if _health["result"] is not None and time.monotonic() - _health["ts"] < _HEALTH_TTL:
+        return ORJSONResponse(_health["result"])
+
+    # Polls that arrive while a check is running wait on it instead of pinging again
+    if _health_task is None:
+        _health_task = asyncio.ensure_future(_ping_services())
+    task = _health_task
+    try:
+        result = await asyncio.shield(task)
+    finally:
+        if _health_task is task and task.done():
+            _health_task = None
+    _health.update(ts=time.monotonic(), result=result)
+    return ORJSONResponse(result)
 
 
 # ─────────── Page Routes ───────────
 
 
+def page(template: str, defaults: Dict[str, Any]):
+    """Decorate a page route whose body returns its template context.
+
+    The page renders with that context (error=None unless the body sets one); if the body
+    raises, it renders `defaults` with the error message instead.
+    """
+    fallback = MappingProxyType(defaults)
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        async def route(request: Request, *args, **kwargs):
+            try:
+                context = await fn(request, *args, **kwargs)
+                return render(template, {"request": request, "error": None, **context})
+            except Exception as e:
+                return render(template, {"request": request, **fallback, "error": str(e)})
+        return route
+    return wrap
+
+
+def _overview_data(con: duckdb.DuckDBPyConnection) -> Dict[str, Any]:
+    """Summary stats and recent activity for the overview page."""
+    # Summary stats plus every breakdown list, shaped by DuckDB into a single row
+    (total_requests, in_progress, deployed, total_time_saved,
+     status_counts, team_counts, recent, audit_entries) = con.execute("""
+        WITH a AS (SELECT COUNT(*) AS total_requests FROM intake_requests),
+             b AS (SELECT COUNT(*) FILTER (WHERE status IN ('Scoping', 'In Build', 'QA')) AS in_progress,
+                          COUNT(*) FILTER (WHERE status IN ('Deployed', 'Measuring')) AS deployed
+                   FROM backlog_items),
+             c AS (SELECT COALESCE(SUM(manual_time_before - ai_time_after), 0) AS total_time_saved
+                   FROM impact_metrics WHERE weeks_deployed > 0),
+             -- Status breakdown
+             s AS (SELECT LIST(STRUCT_PACK(status, count) ORDER BY count DESC, status) AS status_counts
+                   FROM (SELECT status, COUNT(*) AS count FROM backlog_items GROUP BY status)),
+             -- Team breakdown
+             t AS (SELECT LIST(STRUCT_PACK(requester_team, count) ORDER BY count DESC, requester_team) AS team_counts
+                   FROM (SELECT requester_team, COUNT(*) AS count FROM intake_requests GROUP BY requester_team)),
+             -- Recent activity (Triage requests)
+             r AS (SELECT LIST(STRUCT_PACK(id, requester_name, requester_team, triage_summary, urgency, status, created_at)
+                               ORDER BY created_at DESC) AS recent
+                   FROM (SELECT * FROM intake_requests ORDER BY created_at DESC LIMIT 5)),
+             -- Live Event Stream (Audit log)
+             e AS (SELECT LIST(STRUCT_PACK(event_type, description, "timestamp" := CAST(timestamp AS VARCHAR))
+                               ORDER BY timestamp DESC) AS audit_entries
+                   FROM (SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT 5))
+        SELECT * FROM a, b, c, s, t, r, e
+    """).fetchone()
+
+    return {
+        "total_requests": total_requests,
+        "in_progress": in_progress,
+        "deployed": deployed,
+        "total_time_saved": round(total_time_saved, 1),
+        # LIST() over no rows is NULL
+        "status_counts": status_counts or [],
+        "team_counts": team_counts or [],
+        "recent": recent or [],
+        "audit_entries": audit_entries or [],
+    }
+
+
 @app.get("/", response_class=HTMLResponse)
+@page("index.html", {
+    "total_requests": 0, "in_progress": 0, "deployed": 0,
+    "total_time_saved": 0, "status_counts": [], "team_counts": [], "recent": [],
+})
 async def overview(request: Request):
     """Platform overview — summary stats and recent activity."""
-    try:
-        con = get_db()
-        # Summary stats
-        total_requests = con.execute("SELECT COUNT(*) FROM intake_requests").fetchone()[0]
-        in_progress = con.execute("SELECT COUNT(*) FROM backlog_items WHERE status IN ('Scoping', 'In Build', 'QA')").fetchone()[0]
-        deployed = con.execute("SELECT COUNT(*) FROM backlog_items WHERE status IN ('Deployed', 'Measuring')").fetchone()[0]
-        total_time_saved = con.execute("SELECT COALESCE(SUM(manual_time_before - ai_time_after), 0) FROM impact_metrics WHERE weeks_deployed > 0").fetchone()[0]
-
-        # Status breakdown
-        status_counts = con.execute("""
-            SELECT status, COUNT(*) as count
-            FROM backlog_items GROUP BY status ORDER BY count DESC
-        """).fetchdf().to_dict("records")
-
-        # Team breakdown
-        team_counts = con.execute("""
-            SELECT requester_team, COUNT(*) as count
-            FROM intake_requests GROUP BY requester_team ORDER BY count DESC
-        """).fetchdf().to_dict("records")
-
-        # Recent activity (Triage requests)
-        recent = con.execute("""
-            SELECT id, requester_name, requester_team, triage_summary, urgency, status, created_at
-            FROM intake_requests ORDER BY created_at DESC LIMIT 5
-        """).fetchdf().to_dict("records")
-
-        # Live Event Stream (Audit log)
-        audit_entries = con.execute("""
-            SELECT event_type, description, CAST(timestamp AS VARCHAR) as timestamp
-            FROM audit_log ORDER BY timestamp DESC LIMIT 5
-        """).fetchdf().to_dict("records")
-
-        con.close()
-
-        return templates.TemplateResponse("index.html", {
-            "request": request,
-            "total_requests": total_requests,
-            "in_progress": in_progress,
-            "deployed": deployed,
-            "total_time_saved": round(total_time_saved, 1),
-            "status_counts": status_counts,
-            "team_counts": team_counts,
-            "recent": recent,
-            "audit_entries": audit_entries,
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("index.html", {
-            "request": request, "error": str(e),
-            "total_requests": 0, "in_progress": 0, "deployed": 0,
-            "total_time_saved": 0, "status_counts": [], "team_counts": [], "recent": [],
-        })
+    return await cached_dashboard(_overview_data)
+
+
+def _intake_queue(con: duckdb.DuckDBPyConnection) -> List[Dict[str, Any]]:
+    """Latest intake requests for the triage queue."""
+    return rows_as_dicts(con.execute("""
+        SELECT id, requester_name, requester_team, triage_summary, urgency, status, created_at
+        FROM intake_requests 
+        ORDER BY created_at DESC 
+        LIMIT 10
+    """))
 
 
 @app.get("/intake", response_class=HTMLResponse)
+@page("intake.html", {"queue": [], "result": None})
 async def intake_page(request: Request):
     """Intake Triage Queue — view and manage automated ingestions."""
-    try:
-        con = get_db()
-        # Fetch requests that are still in 'Intake' or 'Scoping' for triage
-        queue = con.execute("""
-            SELECT id, requester_name, requester_team, triage_summary, urgency, status, created_at
-            FROM intake_requests 
-            ORDER BY created_at DESC 
-            LIMIT 10
-        """).fetchdf().to_dict("records")
-        con.close()
-        
-        return templates.TemplateResponse("intake.html", {
-            "request": request, 
-            "queue": queue,
-            "result": None, 
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("intake.html", {
-            "request": request, "queue": [], "result": None, "error": str(e),
-        })
+    # Fetch requests that are still in 'Intake' or 'Scoping' for triage
+    return {"queue": await run_db(_intake_queue), "result": None}
+
+
+def _triage_cache_key(pain_point: str, workflow_stage: str, manual_time: str,
+                      urgency: str, requester_team: str) -> str:
+    """llm_cache key: a hash of every triage input, with the pain point case- and whitespace-folded."""
+    parts = (" ".join(pain_point.lower().split()), workflow_stage, manual_time, urgency, requester_team)
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _cached_triage(con: duckdb.DuckDBPyConnection, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """(triage, requirements) stored for this key, or None."""
+    row = con.execute("SELECT triage, requirements FROM llm_cache WHERE key = ?", [key]).fetchone()
+    if row is None:
+        return None
+    return orjson.loads(row[0]), orjson.loads(row[1])
+
+
+def _save_intake(con: duckdb.DuckDBPyConnection, intake_row: list, backlog_row: list,
+                 cache_row: Optional[list] = None):
+    """Insert a new intake request and its backlog item (and any new llm_cache entry) with a single commit."""
+    with transaction(con):
+        con.execute(_SQL_INSERT_INTAKE, intake_row)
+        con.execute(_SQL_INSERT_BACKLOG, backlog_row)
+        if cache_row:
+            con.execute(_SQL_CACHE_TRIAGE, cache_row)
 
 
 @app.post("/intake", response_class=HTMLResponse)
+@page("intake.html", {"result": None})
 async def intake_submit(
     request: Request,
     requester_name: str = Form(...),
@@ -150,249 +401,231 @@ async def intake_submit(
     urgency: str = Form("Medium"),
 ):
     """Process intake form — LLM triage + save to DB."""
-    try:
-        # Triage with AI
-        triage = agent.triage_request(
-            pain_point=pain_point,
-            workflow_stage=workflow_stage,
-            manual_time=f"{manual_time_hours} hours/week",
-            urgency=urgency,
-            requester_team=requester_team,
+    manual_time = f"{manual_time_hours} hours/week"
+    cache_key = _triage_cache_key(pain_point, workflow_stage, manual_time, urgency, requester_team)
+    cache_row = None
+    cached = await run_db(_cached_triage, cache_key)
+    if cached:
+        triage, requirements = cached
+        # Stored model output, but no model call this time
+        triage["_source"] = requirements["_source"] = "cache"
+        triage["_latency_ms"] = 0
+    else:
+        # Triage with AI and generate the requirements brief concurrently
+        triage, requirements = await asyncio.gather(
+            agent.atriage_request(
+                pain_point=pain_point,
+                workflow_stage=workflow_stage,
+                manual_time=manual_time,
+                urgency=urgency,
+                requester_team=requester_team,
+            ),
+            agent.agenerate_requirements(pain_point),
         )
-
-        req_id = f"REQ-{uuid.uuid4().hex[:6].upper()}"
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Generate requirements brief
-        requirements = agent.generate_requirements(pain_point)
-
-        # Save intake request
-        con = get_db()
-        con.execute("""
-            INSERT INTO intake_requests
-            (id, requester_name, requester_team, pain_point, workflow_stage,
-             manual_time_hours, urgency, created_at, gtm_stage, complexity,
-             approach, priority_score, triage_summary, requirements_json, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'Intake')
-        """, [
-            req_id, requester_name, requester_team, pain_point, workflow_stage,
-            manual_time_hours, urgency, now,
-            triage.get("gtm_stage", "Unknown"),
-            triage.get("complexity", "Unknown"),
-            triage.get("approach", "Unknown"),
-            triage.get("priority_score", 5),
-            triage.get("summary", pain_point[:100]),
-            json.dumps(requirements),
-        ])
-
-        # Create backlog item
-        blg_id = f"BLG-{uuid.uuid4().hex[:6].upper()}"
-        con.execute("""
-            INSERT INTO backlog_items
-            (id, request_id, title, requester_name, requester_team, gtm_stage,
-             complexity, approach, priority_score, status, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Intake', ?, ?)
-        """, [
-            blg_id, req_id,
-            triage.get("summary", pain_point[:60]),
-            requester_name, requester_team,
-            triage.get("gtm_stage", "Unknown"),
-            triage.get("complexity", "Unknown"),
-            triage.get("approach", "Unknown"),
-            triage.get("priority_score", 5),
-            now, now,
-        ])
-        con.close()
-
-        return templates.TemplateResponse("intake.html", {
-            "request": request,
-            "result": {
-                "request_id": req_id,
-                "triage": triage,
-                "requirements": requirements,
-                "source": triage.get("_source", "unknown"),
-                "latency_ms": triage.get("_latency_ms", 0),
-            },
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("intake.html", {
-            "request": request, "result": None, "error": str(e),
-        })
+        # Only real model output is worth keeping; mocks are free to regenerate
+        if triage.get("_source") == "llm" and requirements.get("_source") == "llm":
+            cache_row = [cache_key, orjson.dumps(triage).decode(), orjson.dumps(requirements).decode()]
+
+    req_id = _short_id("REQ")
+    blg_id = _short_id("BLG")
+    now = _now_str()
+
+    # Save intake request and create its backlog item
+    await run_db(_save_intake, [
+        req_id, requester_name, requester_team, pain_point, workflow_stage,
+        manual_time_hours, urgency, now,
+        triage.get("gtm_stage", "Unknown"),
+        triage.get("complexity", "Unknown"),
+        triage.get("approach", "Unknown"),
+        triage.get("priority_score", 5),
+        triage.get("summary", pain_point[:100]),
+        # Indented once here so the blueprint prompt can use the stored text directly
+        orjson.dumps(requirements, option=orjson.OPT_INDENT_2).decode(),
+    ], [
+        blg_id, req_id,
+        triage.get("summary", pain_point[:60]),
+        requester_name, requester_team,
+        triage.get("gtm_stage", "Unknown"),
+        triage.get("complexity", "Unknown"),
+        triage.get("approach", "Unknown"),
+        triage.get("priority_score", 5),
+        now, now,
+    ], cache_row, write=True)
+
+    return {
+        "result": {
+            "request_id": req_id,
+            "triage": triage,
+            "requirements": requirements,
+            "source": triage.get("_source", "unknown"),
+            "latency_ms": triage.get("_latency_ms", 0),
+        },
+    }
+
+
+def _backlog_data(con: duckdb.DuckDBPyConnection, team: str, status: str) -> Dict[str, Any]:
+    """Backlog items grouped into Kanban columns, plus the team filter options."""
+    # Build filter query
+    where_clauses = []
+    params = []
+    if team:
+        where_clauses.append("requester_team = ?")
+        params.append(team)
+    if status:
+        where_clauses.append("status = ?")
+        params.append(status)
+
+    where_sql = " AND ".join(where_clauses)
+    if where_sql:
+        where_sql = "WHERE " + where_sql
+
+    # DuckDB builds each Kanban column's card list; only the statuses present come back
+    columns = {col: [] for col in KANBAN_COLUMNS}
+    columns.update(con.execute(f"""
+        SELECT status,
+               LIST(STRUCT_PACK(id, request_id, title, requester_name, requester_team, complexity,
+                                approach, priority_score, assigned_to, status)
+                    ORDER BY priority_score DESC, created_at DESC)
+        FROM backlog_items {where_sql}
+        GROUP BY status
+    """, params).fetchall())
+
+    # Get unique teams for filter
+    teams = [t for (t,) in con.execute("SELECT DISTINCT requester_team FROM backlog_items ORDER BY requester_team").fetchall()]
+
+    return {"columns": columns, "teams": teams, "total_items": sum(map(len, columns.values()))}
 
 
 @app.get("/backlog", response_class=HTMLResponse)
+@page("backlog.html", {
+    "columns": {col: [] for col in KANBAN_COLUMNS},
+    "teams": [], "active_team": "", "active_status": "", "total_items": 0,
+})
 async def backlog_page(request: Request, team: str = "", status: str = ""):
     """Kanban-style backlog board."""
-    try:
-        con = get_db()
-
-        # Build filter query
-        where_clauses = []
-        params = []
-        if team:
-            where_clauses.append("requester_team = ?")
-            params.append(team)
-        if status:
-            where_clauses.append("status = ?")
-            params.append(status)
-
-        where_sql = " AND ".join(where_clauses)
-        if where_sql:
-            where_sql = "WHERE " + where_sql
-
-        items = con.execute(f"""
-            SELECT * FROM backlog_items {where_sql}
-            ORDER BY priority_score DESC, created_at DESC
-        """, params).fetchdf().to_dict("records")
-
-        # Group by status for Kanban columns
-        columns = {
-            "Intake": [], "Scoping": [], "In Build": [],
-            "QA": [], "Deployed": [], "Measuring": [],
-        }
-        for item in items:
-            col = item.get("status", "Intake")
-            if col in columns:
-                columns[col].append(item)
-
-        # Get unique teams for filter
-        teams = con.execute("SELECT DISTINCT requester_team FROM backlog_items ORDER BY requester_team").fetchdf()["requester_team"].tolist()
-        con.close()
-
-        return templates.TemplateResponse("backlog.html", {
-            "request": request,
-            "columns": columns,
-            "teams": teams,
-            "active_team": team,
-            "active_status": status,
-            "total_items": len(items),
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("backlog.html", {
-            "request": request,
-            "columns": {k: [] for k in ["Intake", "Scoping", "In Build", "QA", "Deployed", "Measuring"]},
-            "teams": [], "active_team": "", "active_status": "", "total_items": 0,
-            "error": str(e),
-        })
+    data = await run_db(_backlog_data, team, status)
+    return {**data, "active_team": team, "active_status": status}
+
+
+def _update_status(con: duckdb.DuckDBPyConnection, item_id: str, new_status: str):
+    """Move one backlog item to another column."""
+    now = _now_str()
+    con.execute(_SQL_UPDATE_STATUS, [new_status, now, item_id])
 
 
 @app.post("/backlog/update")
 async def backlog_update(item_id: str = Form(...), new_status: str = Form(...)):
     """Move a backlog item to a new status column."""
+    if new_status not in KANBAN_COLUMNS:
+        return ORJSONResponse({"success": False, "error": f"Unknown status: {new_status}"}, status_code=400)
     try:
-        con = get_db()
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        con.execute(
-            "UPDATE backlog_items SET status = ?, updated_at = ? WHERE id = ?",
-            [new_status, now, item_id],
-        )
-        con.close()
-        return JSONResponse({"success": True})
+        await run_db(_update_status, item_id, new_status, write=True)
+        return ORJSONResponse({"success": True})
     except Exception as e:
-        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+def _get_request(con: duckdb.DuckDBPyConnection, request_id: str) -> Optional[Dict[str, Any]]:
+    """One intake request by id (the columns the builder routes use), or None."""
+    req = rows_as_dicts(con.execute("""
+        SELECT id, requester_name, requester_team, pain_point, gtm_stage, complexity,
+               approach, triage_summary, requirements_json, status
+        FROM intake_requests WHERE id = ?
+    """, [request_id]))
+    return req[0] if req else None
+
+
+def _builder_data(con: duckdb.DuckDBPyConnection, request_id: str):
+    """An intake request and its prompt versions (newest first); (None, []) if it doesn't exist."""
+    item = _get_request(con, request_id)
+    if item is None:
+        return None, []
+
+    # Get prompt versions
+    versions = rows_as_dicts(con.execute("""
+        SELECT version, quality_score, prompt_text, response_text FROM prompt_versions WHERE request_id = ?
+        ORDER BY version DESC
+    """, [request_id]))
+    return item, versions
 
 
 @app.get("/builder/{request_id}", response_class=HTMLResponse)
+@page("builder.html", {"item": None, "blueprint": None, "prompt_versions": []})
 async def builder_page(request: Request, request_id: str):
     """Workflow builder for a specific request."""
-    try:
-        con = get_db()
-        req = con.execute("SELECT * FROM intake_requests WHERE id = ?", [request_id]).fetchdf()
-        if len(req) == 0:
-            con.close()
-            return templates.TemplateResponse("builder.html", {
-                "request": request, "item": None, "error": "Request not found",
-                "blueprint": None, "prompt_versions": [],
-            })
-
-        item = req.to_dict("records")[0]
-
-        # Get prompt versions
-        versions = con.execute("""
-            SELECT * FROM prompt_versions WHERE request_id = ?
-            ORDER BY version DESC
-        """, [request_id]).fetchdf().to_dict("records")
-
-        con.close()
-
-        # Parse stored requirements
-        requirements = None
-        if item.get("requirements_json"):
-            try:
-                requirements = json.loads(item["requirements_json"])
-            except json.JSONDecodeError:
-                pass
-
-        return templates.TemplateResponse("builder.html", {
-            "request": request,
-            "item": item,
-            "requirements": requirements,
-            "blueprint": None,
-            "prompt_versions": versions,
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("builder.html", {
-            "request": request, "item": None, "error": str(e),
-            "blueprint": None, "prompt_versions": [],
-        })
+    item, versions = await run_db(_builder_data, request_id)
+    if item is None:
+        return {"item": None, "error": "Request not found", "blueprint": None, "prompt_versions": []}
+
+    # Parse stored requirements
+    requirements = None
+    if item.get("requirements_json"):
+        try:
+            requirements = orjson.loads(item["requirements_json"])
+        except orjson.JSONDecodeError:
+            pass
+
+    return {
+        "item": item,
+        "requirements": requirements,
+        "blueprint": None,
+        "prompt_versions": versions,
+    }
 
 
 @app.post("/builder/{request_id}/generate")
 async def builder_generate(request: Request, request_id: str):
     """Generate a workflow blueprint using LLM."""
     try:
-        con = get_db()
-        req = con.execute("SELECT * FROM intake_requests WHERE id = ?", [request_id]).fetchdf()
-        if len(req) == 0:
-            con.close()
-            return JSONResponse({"success": False, "error": "Request not found"}, status_code=404)
-
-        item = req.to_dict("records")[0]
-        con.close()
+        item = await run_db(_get_request, request_id)
+        if item is None:
+            return ORJSONResponse({"success": False, "error": "Request not found"}, status_code=404)
 
-        # Parse requirements
+        # Stored already indented by intake_submit, so it goes into the prompt as-is
         req_text = item.get("requirements_json", "")
-        if req_text:
-            try:
-                req_data = json.loads(req_text)
-                req_text = json.dumps(req_data, indent=2)
-            except json.JSONDecodeError:
-                pass
 
-        blueprint = agent.generate_blueprint(
+        blueprint = await agent.agenerate_blueprint(
             title=item.get("triage_summary", ""),
             problem=item.get("pain_point", ""),
             requirements=req_text,
         )
 
-        return JSONResponse({"success": True, "blueprint": blueprint})
+        return ORJSONResponse({"success": True, "blueprint": blueprint})
     except Exception as e:
-        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
 @app.post("/builder/{request_id}/enrich")
 async def builder_enrich(request_id: str):
     """Trigger Relevance AI deep enrichment research."""
     try:
-        con = get_db()
-        req = con.execute("SELECT * FROM intake_requests WHERE id = ?", [request_id]).fetchdf()
-        if len(req) == 0:
-            con.close()
-            return JSONResponse({"success": False, "error": "Request not found"}, status_code=404)
-
-        item = req.to_dict("records")[0]
-        con.close()
+        item = await run_db(_get_request, request_id)
+        if item is None:
+            return ORJSONResponse({"success": False, "error": "Request not found"}, status_code=404)
 
         result = relevance_agent.trigger_research(
             company_name=item.get("requester_team", "Potential Client"),
             context=item.get("pain_point", "")
         )
-        return JSONResponse(result)
+        return ORJSONResponse(result)
     except Exception as e:
-        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+def _next_prompt_version(con: duckdb.DuckDBPyConnection, request_id: str) -> int:
+    """The version number the next saved prompt for this request gets."""
+    return con.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM prompt_versions WHERE request_id = ?",
+        [request_id],
+    ).fetchone()[0] + 1
+
+
+def _save_prompt_version(con: duckdb.DuckDBPyConnection, row: list):
+    """Insert one Prompt Lab version."""
+    con.execute("""
+        INSERT INTO prompt_versions (id, request_id, version, prompt_text, response_text)
+        VALUES (?, ?, ?, ?, ?)
+    """, row)
 
 
 @app.post("/builder/{request_id}/prompt-lab")
@@ -403,136 +636,106 @@ async def prompt_lab_submit(
 ):
     """Submit a prompt to the Prompt Lab and save the version."""
     try:
-        con = get_db()
-
         # Get next version number
-        max_ver = con.execute(
-            "SELECT COALESCE(MAX(version), 0) FROM prompt_versions WHERE request_id = ?",
-            [request_id],
-        ).fetchone()[0]
-        new_ver = max_ver + 1
-
-        # Call LLM with custom prompt
-        from agent.prompts import TRIAGE_SYSTEM_PROMPT
-        raw = agent._call_llm(
+        new_ver = await run_db(_next_prompt_version, request_id)
+
+        # Call LLM with custom prompt (no cursor held while we wait on it)
+        raw = await agent._acall_llm(
             "You are an AI operations assistant. Respond helpfully to the following prompt.",
             prompt_text,
         )
         response_text = raw or "[Mock response] The AI agent would process this prompt and return a structured output based on the task type and context provided."
 
         # Save version
-        pv_id = f"PV-{uuid.uuid4().hex[:6].upper()}"
-        con.execute("""
-            INSERT INTO prompt_versions (id, request_id, version, prompt_text, response_text)
-            VALUES (?, ?, ?, ?, ?)
-        """, [pv_id, request_id, new_ver, prompt_text, response_text])
-        con.close()
-
-        return JSONResponse({
+        pv_id = _short_id("PV")
+        await run_db(_save_prompt_version, [pv_id, request_id, new_ver, prompt_text, response_text], write=True)
+
+        return ORJSONResponse({
             "success": True,
             "version": new_ver,
             "response": response_text,
             "source": "llm" if raw else "mock",
         })
     except Exception as e:
-        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+def _governance_data(con: duckdb.DuckDBPyConnection) -> Dict[str, Any]:
+    """Audit trail, QA checks and governance stats."""
+    # Audit log (recent 20)
+    audit_entries = rows_as_dicts(con.execute("""
+        SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT 20
+    """))
+
+    # QA checks
+    qa_results = rows_as_dicts(con.execute("""
+        SELECT * FROM qa_checks ORDER BY run_at DESC
+    """))
+
+    # Aggregate stats (one statement, one pass per table)
+    total_events, qa_total, qa_passed, active_workflows, avg_quality = con.execute("""
+        WITH a AS (SELECT COUNT(*) AS total_events FROM audit_log),
+             q AS (SELECT COUNT(*) AS qa_total,
+                          COUNT(*) FILTER (WHERE status = 'pass') AS qa_passed,
+                          COUNT(DISTINCT request_id) AS active_workflows
+                   FROM qa_checks),
+             p AS (SELECT COALESCE(AVG(quality_score), 0) AS avg_quality
+                   FROM prompt_versions WHERE quality_score > 0)
+        SELECT * FROM a, q, p
+    """).fetchone()
+    qa_pass_rate = round((qa_passed / qa_total * 100), 1) if qa_total > 0 else 0
+
+    return {
+        "audit_entries": audit_entries,
+        "qa_results": qa_results,
+        "total_events": total_events,
+        "qa_pass_rate": qa_pass_rate,
+        "avg_quality": round(avg_quality, 1),
+        "active_workflows": active_workflows,
+    }
 
 
 @app.get("/governance", response_class=HTMLResponse)
+@page("governance.html", {
+    "audit_entries": [], "qa_results": [],
+    "total_events": 0, "qa_pass_rate": 0, "avg_quality": 0, "active_workflows": 0,
+})
 async def governance_page(request: Request):
     """AI Governance & QA — audit trail, QA checks, prompt versioning."""
-    try:
-        con = get_db()
-
-        # Audit log (recent 20)
-        audit_entries = con.execute("""
-            SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT 20
-        """).fetchdf().to_dict("records")
-
-        # QA checks
-        qa_results = con.execute("""
-            SELECT * FROM qa_checks ORDER BY run_at DESC
-        """).fetchdf().to_dict("records")
-
-        # Aggregate stats
-        total_events = con.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
-
-        qa_total = con.execute("SELECT COUNT(*) FROM qa_checks").fetchone()[0]
-        qa_passed = con.execute("SELECT COUNT(*) FROM qa_checks WHERE status = 'pass'").fetchone()[0]
-        qa_pass_rate = round((qa_passed / qa_total * 100), 1) if qa_total > 0 else 0
-
-        avg_quality = con.execute("""
-            SELECT COALESCE(AVG(quality_score), 0) FROM prompt_versions WHERE quality_score > 0
-        """).fetchone()[0]
-
-        active_workflows = con.execute("""
-            SELECT COUNT(DISTINCT request_id) FROM qa_checks
-        """).fetchone()[0]
-
-        con.close()
-
-        return templates.TemplateResponse("governance.html", {
-            "request": request,
-            "audit_entries": audit_entries,
-            "qa_results": qa_results,
-            "total_events": total_events,
-            "qa_pass_rate": qa_pass_rate,
-            "avg_quality": round(avg_quality, 1),
-            "active_workflows": active_workflows,
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("governance.html", {
-            "request": request, "audit_entries": [], "qa_results": [],
-            "total_events": 0, "qa_pass_rate": 0, "avg_quality": 0,
-            "active_workflows": 0, "error": str(e),
-        })
+    return await cached_dashboard(_governance_data)
+
+
+def _impact_data(con: duckdb.DuckDBPyConnection) -> Dict[str, Any]:
+    """Per-workflow impact metrics and their deployed totals."""
+    metrics = rows_as_dicts(con.execute("""
+        SELECT * FROM impact_metrics ORDER BY weeks_deployed DESC
+    """))
+
+    # Aggregate stats
+    total_time_saved, total_roi, avg_adoption, deployed_count = con.execute("""
+        SELECT COALESCE(SUM(manual_time_before - ai_time_after), 0),
+               COALESCE(SUM(roi_estimate), 0),
+               COALESCE(AVG(adoption_rate), 0),
+               COUNT(*)
+        FROM impact_metrics WHERE weeks_deployed > 0
+    """).fetchone()
+
+    return {
+        "metrics": metrics,
+        "total_time_saved": round(total_time_saved, 1),
+        "total_roi": round(total_roi, 0),
+        "avg_adoption": round(avg_adoption, 1),
+        "deployed_count": deployed_count,
+    }
 
 
 @app.get("/impact", response_class=HTMLResponse)
+@page("impact.html", {
+    "metrics": [], "total_time_saved": 0, "total_roi": 0, "avg_adoption": 0, "deployed_count": 0,
+})
 async def impact_page(request: Request):
     """Impact tracker dashboard."""
-    try:
-        con = get_db()
-
-        metrics = con.execute("""
-            SELECT * FROM impact_metrics ORDER BY weeks_deployed DESC
-        """).fetchdf().to_dict("records")
-
-        # Aggregate stats
-        total_time_saved = con.execute("""
-            SELECT COALESCE(SUM(manual_time_before - ai_time_after), 0)
-            FROM impact_metrics WHERE weeks_deployed > 0
-        """).fetchone()[0]
-
-        total_roi = con.execute("""
-            SELECT COALESCE(SUM(roi_estimate), 0) FROM impact_metrics WHERE weeks_deployed > 0
-        """).fetchone()[0]
-
-        avg_adoption = con.execute("""
-            SELECT COALESCE(AVG(adoption_rate), 0) FROM impact_metrics WHERE weeks_deployed > 0
-        """).fetchone()[0]
-
-        deployed_count = con.execute("""
-            SELECT COUNT(*) FROM impact_metrics WHERE weeks_deployed > 0
-        """).fetchone()[0]
-
-        con.close()
-
-        return templates.TemplateResponse("impact.html", {
-            "request": request,
-            "metrics": metrics,
-            "total_time_saved": round(total_time_saved, 1),
-            "total_roi": round(total_roi, 0),
-            "avg_adoption": round(avg_adoption, 1),
-            "deployed_count": deployed_count,
-            "error": None,
-        })
-    except Exception as e:
-        return templates.TemplateResponse("impact.html", {
-            "request": request, "metrics": [], "error": str(e),
-            "total_time_saved": 0, "total_roi": 0, "avg_adoption": 0, "deployed_count": 0,
-        })
+    return await cached_dashboard(_impact_data)
 
 
 @app.get("/agent-lab", response_class=HTMLResponse)
@@ -589,7 +792,7 @@ async def agent_lab_page(request: Request):
     # Validate selected agent
     selected_agent = next((a for a in agents if a["id"] == selected_id), agents[0])
 
-    return templates.TemplateResponse("agent_lab.html", {
+    return render("agent_lab.html", {
         "request": request,
         "agents": agents,
         "selected_agent": selected_agent,
@@ -609,6 +812,6 @@ async def agent_lab_chat(agent_id: str, payload: ChatMessage):
             agent_id=agent_id,
             message=payload.message
         )
-        return JSONResponse(result)
+        return ORJSONResponse(result)
     except Exception as e:
-        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+        return ORJSONResponse({"status": "error", "message": str(e)}, status_code=500)